@@ -1,14 +1,42 @@
 from flask import Flask # type: ignore
+from werkzeug.middleware.proxy_fix import ProxyFix # type: ignore
 from app.testing.routes import test_bp
 from app.resume.routes import resume_bp
 from app.interview.routes import interview_bp
 from app.redis.routes import redis_bp
 from app.auth.routes import auth_bp
 from app.config import Config
+from app.metrics import init_app as init_metrics
+from app.warmup import init_app as init_warmup, warmup
+from app.supabase_client import supabase_client
+from app.embedding_client import embedding_service
+from app.llm_gateway import llm_gateway
+from app.interview.rag_index import best_practices_index
+from app.interview.utils import problem_catalog
+from app.interview.reference_data import reference_data
+from app.interview.session_store import memory_reporter
+from app.resume.jobs import start_inline_workers
+from app.auth.utils import revocation_list
 
-def create_app():
+def start_background_tasks():
+    """Starts this process's background threads; under gunicorn this runs in each worker after fork."""
+    best_practices_index.start()
+    problem_catalog.start()
+    reference_data.start()
+    revocation_list.start()
+    memory_reporter.start()
+    if Config.RESUME_INLINE_WORKERS:
+        start_inline_workers(Config.RESUME_INLINE_WORKERS)
+    warmup.start(enabled=Config.WARMUP_ENABLED)
+
+def create_app(start_background=True):
     app = Flask(__name__)
     app.config.from_object(Config) 
+    if Config.TRUSTED_PROXY_HOPS:
+        # request.remote_addr becomes the client address taken from X-Forwarded-For.
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=Config.TRUSTED_PROXY_HOPS, x_proto=Config.TRUSTED_PROXY_HOPS)
+    init_metrics(app)
+    init_warmup(app)
 
     app.register_blueprint(test_bp,url_prefix='/testing')
     app.register_blueprint(resume_bp,url_prefix='/resume')
@@ -16,4 +44,20 @@ def create_app():
     app.register_blueprint(redis_bp,url_prefix='/redis')
     app.register_blueprint(auth_bp,url_prefix='/auth')
 
+    # Heavy libraries are imported on first use; warm-up pays that cost in the
+    # background so /ready can hold traffic back until it is done. Steps with a
+    # preload function can instead run in a pre-fork master (see gunicorn.conf.py)
+    # so workers share the loaded data copy-on-write. The embedding model only
+    # loads its weights there and the RAG index is only read from disk, never
+    # built: running inference before fork can leave the children's OpenMP
+    # thread pool unusable. A step that fails to preload is retried per worker.
+    warmup.register("supabase", lambda: supabase_client.client)
+    warmup.register("reference_data", reference_data.refresh, preload=reference_data.refresh)
+    warmup.register("rag_index", best_practices_index.warm_up, preload=best_practices_index.preload)
+    warmup.register("embedding_model", embedding_service.warm_up, preload=lambda: embedding_service.model)
+    warmup.register("llm", llm_gateway.warm_up)
+
+    if start_background:
+        start_background_tasks()
+
     return app
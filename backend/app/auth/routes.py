@@ -1,6 +1,7 @@
 from flask import request, jsonify, Blueprint
 from app.supabase_client import supabase_client
-from .utils import hash_password, verify_password, generate_token
+from app.metrics import track_stage
+from .utils import hash_password, verify_password, generate_token, verify_request_token, revocation_list, login_throttled, record_failed_login, clear_failed_logins
 
 auth_bp = Blueprint('auth',__name__)
 
@@ -16,10 +17,11 @@ def sign_up():
     hashed_password = hash_password(password)
 
     try:
-        response = supabase_client.table('auth').insert({
-            "username": username,
-            "password": hashed_password
-        }).execute()
+        with track_stage("supabase"):
+            response = supabase_client.table('auth').insert({
+                "username": username,
+                "password": hashed_password
+            }).execute()
     except Exception as e:
         return jsonify({"message": str(e)}), 500
 
@@ -36,22 +38,32 @@ def login():
     if not username or not password:
         return jsonify({"message": "Username and password are required"}), 400
 
-    response = supabase_client.table('auth').select("*").eq("username", username).execute()
+    if login_throttled(username):
+        return jsonify({"message": "Too many login attempts, please try again later"}), 429
+
+    with track_stage("supabase"):
+        response = supabase_client.table('auth').select("id, password").eq("username", username).execute()
 
     # Access the `data` attribute directly
     users = response.data
 
     if not users or len(users) == 0:
+        record_failed_login(username)
         return jsonify({"message": "Invalid username or password"}), 401
 
     user = users[0]
     if not verify_password(user["password"], password):
+        record_failed_login(username)
         return jsonify({"message": "Invalid username or password"}), 401
 
+    clear_failed_logins(username)
     token = generate_token(user["id"])
     return jsonify({"token": token}), 200
 
 
 @auth_bp.route('/logout', methods=['POST'])
 def logout():
+    payload, error = verify_request_token()
+    if payload is not None and payload.get("jti"):
+        revocation_list.revoke(payload["jti"], payload["exp"])
     return jsonify({"message": "Logged out successfully"}), 200
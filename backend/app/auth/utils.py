@@ -1,12 +1,24 @@
 import jwt
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify, g
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 import os
+from app.background import PeriodicTask
+from app.config import Config
+from app.metrics import timed
+from app.redis_client import redis_client
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")  
+REVOKED_TOKENS_KEY = "auth:revoked"
+LOGIN_ATTEMPTS_PREFIX = "auth:login_attempts:"
 
 def hash_password(password):
     return generate_password_hash(password)
@@ -17,6 +29,7 @@ def verify_password(hashed_password, password):
 def generate_token(user_id):
     payload = {
         "user_id": str(user_id),
+        "jti": uuid.uuid4().hex,
         "exp": datetime.utcnow() + timedelta(hours=1) 
     }
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
@@ -28,3 +41,134 @@ def decode_token(token):
         return {"error": "Token has expired"}
     except jwt.InvalidTokenError:
         return {"error": "Invalid token"}
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_size=Config.AUTH_TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            payload = self._tokens.get(token)
+            if payload is None:
+                return None
+            if payload["exp"] <= time.time():
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            return payload
+
+    def put(self, token, payload):
+        with self._lock:
+            self._tokens[token] = payload
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+
+
+class RevocationList:
+    """Revoked token ids, stored in Redis and mirrored in memory.
+
+    Checks only read the local copy; a background sync picks up tokens
+    revoked on other workers within AUTH_REVOCATION_SYNC_SECONDS.
+    """
+
+    def __init__(self, sync_seconds=Config.AUTH_REVOCATION_SYNC_SECONDS):
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._syncer = PeriodicTask("auth-revocation-sync", sync_seconds, self.sync)
+
+    def start(self):
+        self._syncer.start()
+
+    def stop(self):
+        self._syncer.stop()
+
+    @timed("redis")
+    def revoke(self, jti, exp):
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zadd(REVOKED_TOKENS_KEY, {jti: exp})
+        pipe.zremrangebyscore(REVOKED_TOKENS_KEY, 0, time.time())
+        pipe.execute()
+        with self._lock:
+            self._revoked[jti] = exp
+
+    def is_revoked(self, jti):
+        return jti in self._revoked
+
+    def sync(self):
+        now = time.time()
+        revoked = dict(redis_client.zrangebyscore(REVOKED_TOKENS_KEY, now, "+inf", withscores=True))
+        with self._lock:
+            # Keep local revocations that have not reached Redis yet.
+            for jti, exp in self._revoked.items():
+                if exp > now:
+                    revoked.setdefault(jti, exp)
+            self._revoked = revoked
+
+
+verified_tokens = VerifiedTokenCache()
+revocation_list = RevocationList()
+
+def _bearer_token():
+    header = request.headers.get("Authorization", "")
+    if header.startswith("Bearer "):
+        return header[len("Bearer "):].strip()
+    return None
+
+def verify_request_token():
+    token = _bearer_token()
+    if not token:
+        return None, "Missing authorization token"
+
+    payload = verified_tokens.get(token)
+    if payload is None:
+        payload = decode_token(token)
+        if "error" in payload:
+            return None, payload["error"]
+        verified_tokens.put(token, payload)
+
+    if revocation_list.is_revoked(payload.get("jti")):
+        return None, "Token has been revoked"
+    return payload, None
+
+def require_auth(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not Config.AUTH_REQUIRED:
+            return view(*args, **kwargs)
+
+        payload, error = verify_request_token()
+        if error:
+            return jsonify({"message": error}), 401
+        g.user_id = payload["user_id"]
+        return view(*args, **kwargs)
+    return wrapper
+
+def _login_attempt_keys(username):
+    keys = [LOGIN_ATTEMPTS_PREFIX + f"user:{username}"]
+    # Only meaningful when remote_addr is the client, i.e. with TRUSTED_PROXY_HOPS set behind a balancer.
+    if Config.LOGIN_MAX_ATTEMPTS_PER_IP:
+        keys.append(LOGIN_ATTEMPTS_PREFIX + f"ip:{request.remote_addr}")
+    return keys
+
+@timed("redis")
+def login_throttled(username):
+    attempts = redis_client.mget(*_login_attempt_keys(username))
+    if int(attempts[0] or 0) >= Config.LOGIN_MAX_ATTEMPTS:
+        return True
+    return len(attempts) > 1 and int(attempts[1] or 0) >= Config.LOGIN_MAX_ATTEMPTS_PER_IP
+
+@timed("redis")
+def record_failed_login(username):
+    pipe = redis_client.pipeline(transaction=False)
+    for key in _login_attempt_keys(username):
+        pipe.incr(key)
+        pipe.expire(key, Config.LOGIN_ATTEMPT_WINDOW_SECONDS)
+    pipe.execute()
+
+@timed("redis")
+def clear_failed_logins(username):
+    redis_client.delete(_login_attempt_keys(username)[0])
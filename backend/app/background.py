@@ -0,0 +1,35 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    def __init__(self, name, interval, func, run_immediately=True):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.run_immediately = run_immediately
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        if not self.run_immediately and self._stop.wait(self.interval):
+            return
+        while True:
+            try:
+                self.func()
+            except Exception as e:
+                logger.error(f"Error in background task {self.name}: {e}")
+            if self._stop.wait(self.interval):
+                return
@@ -0,0 +1,14 @@
+def _gevent_patched():
+    try:
+        from gevent import monkey # type: ignore
+    except ImportError:
+        return False
+    return monkey.is_module_patched('threading')
+
+def run_blocking(func, *args, **kwargs):
+    # CPU-bound work (model inference, PDF parsing) would stall every greenlet
+    # on the hub, so under gevent it runs on the hub's native thread pool.
+    if _gevent_patched():
+        import gevent # type: ignore
+        return gevent.get_hub().threadpool.apply(func, args, kwargs)
+    return func(*args, **kwargs)
@@ -3,4 +3,89 @@ import os
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'default_secret_key')
     UPLOAD_FOLDER = "./uploads"
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024 
\ No newline at end of file
+    MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+
+    RAG_INDEX_DIR = os.environ.get('RAG_INDEX_DIR', './rag_index')
+    RAG_INDEX_REFRESH_SECONDS = int(os.environ.get('RAG_INDEX_REFRESH_SECONDS', 300))
+    RAG_INDEX_WAIT_SECONDS = float(os.environ.get('RAG_INDEX_WAIT_SECONDS', 30))
+    RAG_EMBEDDING_BACKEND = os.environ.get('RAG_EMBEDDING_BACKEND', 'local')  # local or google
+    RAG_INDEX_QUANTIZATION = os.environ.get('RAG_INDEX_QUANTIZATION', 'fp16')  # fp16, int8 or none
+
+    EMBEDDING_MODEL = os.environ.get('EMBEDDING_MODEL', 'paraphrase-MiniLM-L6-v2')
+    EMBEDDING_CACHE_SIZE = int(os.environ.get('EMBEDDING_CACHE_SIZE', 2048))
+    EMBEDDING_BATCH_SIZE = int(os.environ.get('EMBEDDING_BATCH_SIZE', 32))
+
+    RESUME_EVAL_WORKERS = int(os.environ.get('RESUME_EVAL_WORKERS', 8))
+    RESUME_STAGE_TIMEOUTS = {
+        "keyword_score": float(os.environ.get('RESUME_KEYWORD_TIMEOUT', 10)),
+        "grammar_score": float(os.environ.get('RESUME_GRAMMAR_TIMEOUT', 20)),
+        "layout_score": float(os.environ.get('RESUME_LAYOUT_TIMEOUT', 2)),
+        "suggestions": float(os.environ.get('RESUME_SUGGESTIONS_TIMEOUT', 30)),
+        "review": float(os.environ.get('RESUME_REVIEW_TIMEOUT', 30)),
+        "local_review": float(os.environ.get('RESUME_LOCAL_REVIEW_TIMEOUT', 2)),
+    }
+
+    # Chunks stay under the embedding model's token window (about 128 tokens for MiniLM).
+    RESUME_MATCH_CHUNK_WORDS = int(os.environ.get('RESUME_MATCH_CHUNK_WORDS', 60))
+    RESUME_MATCH_MAX_REQUIREMENTS = int(os.environ.get('RESUME_MATCH_MAX_REQUIREMENTS', 50))
+    RESUME_MATCH_THRESHOLD = float(os.environ.get('RESUME_MATCH_THRESHOLD', 0.5))
+
+    RESUME_EVAL_MODES = ("fast", "structured", "legacy")
+    RESUME_EVAL_MODE = os.environ.get('RESUME_EVAL_MODE', 'structured')
+
+    RESUME_CACHE_TTL_SECONDS = int(os.environ.get('RESUME_CACHE_TTL_SECONDS', 24 * 60 * 60))
+    RESUME_CACHE_MAX_ENTRIES = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', 5000))
+
+    PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 20))
+    PDF_MAX_CHARS = int(os.environ.get('PDF_MAX_CHARS', 100000))
+    PDF_TEXT_CACHE_TTL_SECONDS = int(os.environ.get('PDF_TEXT_CACHE_TTL_SECONDS', 24 * 60 * 60))
+
+    INTERVIEW_SESSION_TTL_SECONDS = int(os.environ.get('INTERVIEW_SESSION_TTL_SECONDS', 2 * 60 * 60))
+    INTERVIEW_IDEMPOTENCY_PENDING_SECONDS = int(os.environ.get('INTERVIEW_IDEMPOTENCY_PENDING_SECONDS', 120))
+    INTERVIEW_SESSION_COMPRESS_BYTES = int(os.environ.get('INTERVIEW_SESSION_COMPRESS_BYTES', 512))
+    INTERVIEW_MEMORY_REPORT_SECONDS = int(os.environ.get('INTERVIEW_MEMORY_REPORT_SECONDS', 5 * 60))
+    INTERVIEW_MEMORY_REPORT_SAMPLE = int(os.environ.get('INTERVIEW_MEMORY_REPORT_SAMPLE', 200))
+    INTERVIEW_PROMPT_TOKEN_BUDGET = int(os.environ.get('INTERVIEW_PROMPT_TOKEN_BUDGET', 6000))
+    INTERVIEW_RECENT_MESSAGES = int(os.environ.get('INTERVIEW_RECENT_MESSAGES', 6))
+    INTERVIEW_SUMMARY_BATCH = int(os.environ.get('INTERVIEW_SUMMARY_BATCH', 4))
+    INTERVIEW_SUMMARY_WORKERS = int(os.environ.get('INTERVIEW_SUMMARY_WORKERS', 2))
+
+    LEETCODE_TIMEOUT_SECONDS = float(os.environ.get('LEETCODE_TIMEOUT_SECONDS', 10))
+    ASYNC_MAX_CONNECTIONS = int(os.environ.get('ASYNC_MAX_CONNECTIONS', 2000))
+
+    PROBLEM_CATALOG_PATH = os.environ.get('PROBLEM_CATALOG_PATH', './cache/problem_catalog.json')
+    PROBLEM_CATALOG_REFRESH_SECONDS = int(os.environ.get('PROBLEM_CATALOG_REFRESH_SECONDS', 6 * 60 * 60))
+
+    REFERENCE_DATA_TTL_SECONDS = int(os.environ.get('REFERENCE_DATA_TTL_SECONDS', 10 * 60))
+    REFERENCE_DATA_MISS_REFRESH_SECONDS = int(os.environ.get('REFERENCE_DATA_MISS_REFRESH_SECONDS', 60))
+
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini')
+    LLM_MODEL = os.environ.get('LLM_MODEL', 'gemini-1.5-flash')
+    LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 16))
+    LLM_MAX_RETRIES = int(os.environ.get('LLM_MAX_RETRIES', 2))
+    LLM_TIMEOUT_SECONDS = float(os.environ.get('LLM_TIMEOUT_SECONDS', 30))
+    LLM_RETRY_BASE_SECONDS = float(os.environ.get('LLM_RETRY_BASE_SECONDS', 0.5))
+    LLM_FAKE_LATENCY_SECONDS = float(os.environ.get('LLM_FAKE_LATENCY_SECONDS', 0))
+
+    RESUME_BATCH_MAX_FILES = int(os.environ.get('RESUME_BATCH_MAX_FILES', 50))
+
+    RESUME_JOB_TTL_SECONDS = int(os.environ.get('RESUME_JOB_TTL_SECONDS', 60 * 60))
+    RESUME_JOB_MAX_ATTEMPTS = int(os.environ.get('RESUME_JOB_MAX_ATTEMPTS', 3))
+    RESUME_JOB_VISIBILITY_SECONDS = int(os.environ.get('RESUME_JOB_VISIBILITY_SECONDS', 5 * 60))
+    RESUME_INLINE_WORKERS = int(os.environ.get('RESUME_INLINE_WORKERS', 0))
+
+    AUTH_REQUIRED = os.environ.get('AUTH_REQUIRED', 'false').lower() in ('1', 'true', 'yes')
+    AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+    AUTH_REVOCATION_SYNC_SECONDS = int(os.environ.get('AUTH_REVOCATION_SYNC_SECONDS', 5))
+    LOGIN_MAX_ATTEMPTS = int(os.environ.get('LOGIN_MAX_ATTEMPTS', 5))
+    # 0 disables the per-IP limit; behind a load balancer also set TRUSTED_PROXY_HOPS.
+    LOGIN_MAX_ATTEMPTS_PER_IP = int(os.environ.get('LOGIN_MAX_ATTEMPTS_PER_IP', 0))
+    # Number of proxies in front of the app whose X-Forwarded-For is trusted.
+    TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+    LOGIN_ATTEMPT_WINDOW_SECONDS = int(os.environ.get('LOGIN_ATTEMPT_WINDOW_SECONDS', 15 * 60))
+
+    WARMUP_ENABLED = os.environ.get('WARMUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    WARMUP_TIMEOUT_SECONDS = float(os.environ.get('WARMUP_TIMEOUT_SECONDS', 180))
+    # First retry delay for a failed warm-up step, doubled up to the max; 0 disables retries.
+    WARMUP_RETRY_SECONDS = float(os.environ.get('WARMUP_RETRY_SECONDS', 15))
+    WARMUP_MAX_RETRY_SECONDS = float(os.environ.get('WARMUP_MAX_RETRY_SECONDS', 300))
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from app.config import Config
+from app.concurrency import run_blocking
+from app.metrics import track_stage
+
+
+class EmbeddingService:
+    def __init__(self, model_name=Config.EMBEDDING_MODEL, cache_size=Config.EMBEDDING_CACHE_SIZE,
+                 batch_size=Config.EMBEDDING_BATCH_SIZE):
+        self.model_name = model_name
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer # type: ignore
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, texts):
+        keys = [hashlib.sha256(text.encode('utf-8')).hexdigest() for text in texts]
+        vectors = [None] * len(texts)
+        missing = {}
+
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    vectors[i] = vector
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+                    self.misses += 1
+
+        if missing:
+            # Duplicate texts in one call are only encoded once.
+            missing_keys = list(missing)
+            missing_texts = [texts[missing[key][0]] for key in missing_keys]
+            with track_stage("embedding"):
+                encoded = run_blocking(self.model.encode, missing_texts, batch_size=self.batch_size)
+
+            with self._cache_lock:
+                for key, vector in zip(missing_keys, encoded):
+                    for i in missing[key]:
+                        vectors[i] = vector
+                    self._cache[key] = vector
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.vstack(vectors)
+
+    def warm_up(self):
+        # Loads the weights and runs one forward pass, bypassing the cache.
+        self.model.encode(["warm up"], batch_size=self.batch_size)
+
+    def stats(self):
+        with self._cache_lock:
+            return {
+                "model": self.model_name,
+                "loaded": self._model is not None,
+                "cache_entries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+embedding_service = EmbeddingService()
@@ -0,0 +1,88 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.config import Config
+from app.llm_gateway import llm_gateway
+from .session_store import load_summary_state, update_summary
+
+logger = logging.getLogger(__name__)
+
+summary_executor = ThreadPoolExecutor(max_workers=Config.INTERVIEW_SUMMARY_WORKERS, thread_name_prefix="interview-summary")
+_summaries_in_flight = set()
+_summaries_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    # Roughly four characters per token for English text.
+    return len(str(text)) // 4 + 1
+
+def history_window():
+    # Messages not yet folded into the summary are fetched along with the recent ones.
+    return Config.INTERVIEW_RECENT_MESSAGES + 2 * Config.INTERVIEW_SUMMARY_BATCH
+
+def build_prompt_context(session_data, reserved_tokens=0):
+    budget = Config.INTERVIEW_PROMPT_TOKEN_BUDGET - reserved_tokens
+    summary = session_data.get("summary", "")
+    summary_upto = session_data.get("summary_upto", 0)
+    offset = session_data.get("history_offset", 0)
+    history = session_data["chat_history"][max(0, summary_upto - offset):]
+
+    recent = history[-Config.INTERVIEW_RECENT_MESSAGES:]
+    older = history[:-Config.INTERVIEW_RECENT_MESSAGES] if len(history) > len(recent) else []
+
+    while len(recent) > 1 and sum(estimate_tokens(m) for m in recent) > budget:
+        recent = recent[1:]
+    used = estimate_tokens(summary) + sum(estimate_tokens(m) for m in recent)
+
+    # Older messages still waiting for the summary go in newest-first while they fit.
+    kept_older = []
+    for message in reversed(older):
+        cost = estimate_tokens(message)
+        if used + cost > budget:
+            break
+        kept_older.insert(0, message)
+        used += cost
+
+    resume = session_data.get("resume", "")
+    resume_chars = max(0, budget - used) * 4
+    if len(resume) > resume_chars:
+        resume = resume[:resume_chars]
+
+    return {
+        "summary": summary,
+        "chat_history": kept_older + recent,
+        "resume": resume,
+    }
+
+def schedule_summary_refresh(session_id, history_length, summary_upto):
+    upto = history_length - Config.INTERVIEW_RECENT_MESSAGES
+    if upto - summary_upto < Config.INTERVIEW_SUMMARY_BATCH:
+        return
+
+    with _summaries_lock:
+        if session_id in _summaries_in_flight:
+            return
+        _summaries_in_flight.add(session_id)
+    summary_executor.submit(_refresh_summary, session_id, upto)
+
+def _refresh_summary(session_id, upto):
+    try:
+        summary, summary_upto, messages = load_summary_state(session_id, upto)
+        if not messages:
+            return
+
+        prompt = f'''
+        You are keeping notes for an ongoing technical interview.
+        Current summary of the interview so far: {summary or "None"}
+        New messages since that summary: {messages}
+        Rewrite the summary so it also covers the new messages. Keep the topics and questions already covered,
+        the candidate's key claims, strengths and weaknesses, and any follow-ups already asked.
+        Respond with plain text only, in at most 200 words.
+        '''
+        summary = llm_gateway.generate(prompt, "interview.summary")
+        update_summary(session_id, summary.strip(), summary_upto + len(messages))
+    except Exception as e:
+        logger.error(f"Error occurred while summarizing interview {session_id}: {e}")
+    finally:
+        with _summaries_lock:
+            _summaries_in_flight.discard(session_id)
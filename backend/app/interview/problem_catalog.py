@@ -0,0 +1,114 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import redis
+from app.background import PeriodicTask
+from app.config import Config
+from app.metrics import track_stage
+from app.redis_client import redis_client
+from app.supabase_client import supabase_client
+
+logger = logging.getLogger(__name__)
+
+CATALOG_KEY = "problem_catalog"
+
+
+class ProblemCatalog:
+    """In-memory snapshot of the problems table with LeetCode details.
+
+    The snapshot is shared through Redis (and a local file as a fallback),
+    so only one worker per refresh interval talks to Supabase and LeetCode.
+    """
+
+    def __init__(self, fetch_details, snapshot_path=Config.PROBLEM_CATALOG_PATH,
+                 refresh_seconds=Config.PROBLEM_CATALOG_REFRESH_SECONDS):
+        self.fetch_details = fetch_details
+        self.snapshot_path = snapshot_path
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._problems = {}
+        self._refreshed_at = 0
+        self._refresher = PeriodicTask("problem-catalog-refresh", refresh_seconds, self.refresh)
+
+    def start(self):
+        snapshot = self._read_redis() or self._read_file()
+        if snapshot is not None:
+            self._install(snapshot)
+        self._refresher.run_immediately = not self._problems or self._is_stale(self._refreshed_at)
+        self._refresher.start()
+
+    def stop(self):
+        self._refresher.stop()
+
+    def get(self, problem_id):
+        with self._lock:
+            return self._problems.get(str(problem_id), {}).get("details")
+
+    def refresh(self):
+        snapshot = self._read_redis()
+        if snapshot is not None and not self._is_stale(snapshot["refreshed_at"]):
+            self._install(snapshot)
+            return
+
+        with track_stage("supabase"):
+            rows = supabase_client.table("problems").select("id, name").execute().data
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            details = list(executor.map(self._fetch_or_none, rows))
+
+        with self._lock:
+            problems = dict(self._problems)
+        for row, detail in zip(rows, details):
+            if detail is not None:
+                problems[str(row["id"])] = {"name": row["name"], "details": detail}
+
+        snapshot = {"refreshed_at": time.time(), "problems": problems}
+        self._install(snapshot)
+        self._write(snapshot)
+        logger.info(f"Problem catalog refreshed with {len(problems)} problems")
+
+    def _fetch_or_none(self, row):
+        # One failed problem keeps its previous entry instead of aborting the refresh.
+        try:
+            return self.fetch_details(row["name"])
+        except Exception as e:
+            logger.warning(f"Could not fetch problem {row['name']}: {e}")
+            return None
+
+    def _is_stale(self, refreshed_at):
+        return time.time() - refreshed_at >= self.refresh_seconds
+
+    def _install(self, snapshot):
+        with self._lock:
+            self._problems = snapshot["problems"]
+            self._refreshed_at = snapshot["refreshed_at"]
+
+    def _read_redis(self):
+        try:
+            snapshot = redis_client.get(CATALOG_KEY)
+        except redis.RedisError as e:
+            logger.warning(f"Could not read problem catalog from Redis: {e}")
+            return None
+        return json.loads(snapshot) if snapshot else None
+
+    def _read_file(self):
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, snapshot):
+        data = json.dumps(snapshot)
+        try:
+            redis_client.set(CATALOG_KEY, data)
+        except redis.RedisError as e:
+            logger.warning(f"Could not write problem catalog to Redis: {e}")
+
+        os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+        tmp = f"{self.snapshot_path}.tmp-{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp, self.snapshot_path)
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import numpy as np
+from dotenv import load_dotenv
+from app.concurrency import run_blocking
+from app.embedding_client import embedding_service
+from app.metrics import track_stage
+
+GOOGLE_EMBEDDING_MODEL = "models/embedding-001"
+
+
+class GoogleEmbeddings:
+    """Remote Gemini embeddings through langchain; every call is a network round trip."""
+
+    name = "google"
+    model_name = GOOGLE_EMBEDDING_MODEL
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google.oauth2 import service_account  # type: ignore
+                    from langchain_google_genai import GoogleGenerativeAIEmbeddings  # type: ignore
+
+                    load_dotenv()
+                    credentials_json = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
+                    if not credentials_json:
+                        raise Exception("Service account credentials not found in environment variables")
+
+                    credentials = service_account.Credentials.from_service_account_info(json.loads(credentials_json))
+                    self._client = GoogleGenerativeAIEmbeddings(model=self.model_name, credentials=credentials)
+        return self._client
+
+    def warm_up(self):
+        self.client
+
+    def embed_documents(self, texts):
+        return np.asarray(self.client.embed_documents(texts), dtype='float32')
+
+    def embed_query(self, text):
+        with track_stage("embedding"):
+            return np.asarray(self.client.embed_query(text), dtype='float32')
+
+
+class LocalEmbeddings:
+    """In-process sentence-transformers model, shared with the resume scorer.
+
+    The corpus is encoded in batches straight through the model so it does
+    not flush the query cache; queries go through embedding_service and hit
+    its LRU cache for repeated answers.
+    """
+
+    name = "local"
+
+    def __init__(self, service=embedding_service):
+        self.service = service
+
+    @property
+    def model_name(self):
+        return self.service.model_name
+
+    def warm_up(self):
+        self.service.warm_up()
+
+    def embed_documents(self, texts):
+        with track_stage("embedding"):
+            vectors = run_blocking(self.service.model.encode, texts, batch_size=self.service.batch_size)
+        return np.asarray(vectors, dtype='float32')
+
+    def embed_query(self, text):
+        return np.asarray(self.service.encode([text])[0], dtype='float32')
+
+
+def create_embeddings(name):
+    if name == 'local':
+        return LocalEmbeddings()
+    if name == 'google':
+        return GoogleEmbeddings()
+    raise ValueError(f"Unknown RAG embedding backend: {name}")
@@ -0,0 +1,222 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import shutil
+import threading
+import numpy as np
+from app.background import PeriodicTask
+from app.config import Config
+from app.metrics import track_stage
+from app.supabase_client import supabase_client
+from .rag_embeddings import create_embeddings
+
+logger = logging.getLogger(__name__)
+
+RAG_BUCKET = 'ragfiles'
+RAG_FILE = 'answers_followup_questions.csv'
+
+
+def _normalize(vectors):
+    # Unit vectors make inner product equal to cosine similarity.
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def _create_index(dim, quantization):
+    import faiss  # type: ignore
+
+    if quantization == 'none':
+        return faiss.IndexFlatIP(dim)
+    quantizer_types = {'fp16': faiss.ScalarQuantizer.QT_fp16, 'int8': faiss.ScalarQuantizer.QT_8bit}
+    if quantization not in quantizer_types:
+        raise ValueError(f"Unknown RAG index quantization: {quantization}")
+    return faiss.IndexScalarQuantizer(dim, quantizer_types[quantization], faiss.METRIC_INNER_PRODUCT)
+
+
+class BestPracticesIndex:
+    """FAISS index over the best-practices CSV, built once per CSV content hash.
+
+    Vectors come from a pluggable embedding backend (the local
+    sentence-transformers model by default) and are stored fp16 or int8
+    quantized. Builds are written to RAG_INDEX_DIR/<build id>/, where the id
+    covers the CSV hash, backend, model and quantization, and the active one is
+    recorded in RAG_INDEX_DIR/current.json, so every worker just loads the
+    files from disk. A background task loads the active build, then polls
+    the bucket's ETag and only downloads and rebuilds when the file changed.
+    """
+
+    def __init__(self, index_dir=Config.RAG_INDEX_DIR, refresh_seconds=Config.RAG_INDEX_REFRESH_SECONDS,
+                 backend=Config.RAG_EMBEDDING_BACKEND, quantization=Config.RAG_INDEX_QUANTIZATION):
+        self.index_dir = index_dir
+        self.backend = backend
+        self.quantization = quantization
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._index = None
+        self._texts = []
+        self._sha256 = None
+        self._etag = None
+        self._embeddings = None
+        self._refresher = PeriodicTask("rag-index-refresh", refresh_seconds, self._sync)
+
+    @property
+    def embeddings(self):
+        if self._embeddings is None:
+            self._embeddings = create_embeddings(self.backend)
+        return self._embeddings
+
+    def start(self):
+        self._refresher.start()
+
+    def stop(self):
+        self._refresher.stop()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def preload(self):
+        # Loads an existing build for a pre-fork master. Building would run the
+        # embedding model and Supabase calls before fork, so a missing build is
+        # left to each worker's background refresh instead.
+        if not self.load_current():
+            raise FileNotFoundError(f"No RAG index build in {self.index_dir} to preload")
+
+    def warm_up(self, timeout=Config.WARMUP_TIMEOUT_SECONDS):
+        if not self._ready.wait(timeout):
+            raise TimeoutError(f"RAG index was not ready after {timeout}s")
+        # Loads the model or client so the first query does not pay for it.
+        self.embeddings.warm_up()
+
+    def search(self, query, k=3):
+        if not self._ready.wait(Config.RAG_INDEX_WAIT_SECONDS):
+            logger.warning("RAG index is not ready, skipping best practice retrieval")
+            return []
+
+        with self._lock:
+            index, texts = self._index, self._texts
+
+        query_vec = _normalize(np.asarray([self.embeddings.embed_query(query)], dtype='float32'))
+        with track_stage("vector_search"):
+            _, ids = index.search(query_vec, min(k, len(texts)))
+        return [texts[i] for i in ids[0] if i >= 0]
+
+    def load_current(self):
+        manifest = self._read_manifest()
+        if manifest is None:
+            return False
+        # A build made with another backend, model or quantization is rebuilt by refresh().
+        build_id = self._build_id(manifest["sha256"])
+        if manifest.get("build") != build_id or not os.path.exists(self._index_path(build_id)):
+            return False
+        self._load(manifest["sha256"], manifest.get("etag"))
+        return True
+
+    def _sync(self):
+        if not self._ready.is_set():
+            try:
+                self.load_current()
+            except Exception as e:
+                logger.warning(f"Could not load RAG index from disk: {e}")
+        self.refresh()
+
+    def refresh(self):
+        etag = self._remote_etag()
+        if etag is not None and etag == self._etag and self._ready.is_set():
+            return
+
+        with track_stage("supabase"):
+            data = supabase_client.storage.from_(RAG_BUCKET).download(RAG_FILE)
+        sha256 = hashlib.sha256(data).hexdigest()
+        if sha256 == self._sha256 and self._ready.is_set():
+            self._etag = etag
+            self._write_manifest(sha256, etag)
+            return
+
+        if not os.path.exists(self._index_path(self._build_id(sha256))):
+            self._build(sha256, data)
+        self._write_manifest(sha256, etag)
+        self._load(sha256, etag)
+        logger.info(f"RAG index switched to {sha256[:12]} ({self.backend}, {self.quantization})")
+
+    def _build(self, sha256, data):
+        import faiss  # type: ignore
+        import pandas as pd
+
+        df = pd.read_csv(io.BytesIO(data))
+        texts = df[['Answer', 'Follow-Up Question']].agg(' '.join, axis=1).tolist()
+        vectors = _normalize(np.asarray(self.embeddings.embed_documents(texts), dtype='float32'))
+
+        index = _create_index(vectors.shape[1], self.quantization)
+        # Only int8 needs training (per-dimension ranges); for the others it is a no-op.
+        index.train(vectors)
+        index.add(vectors)
+
+        target = os.path.join(self.index_dir, self._build_id(sha256))
+        tmp = f"{target}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        faiss.write_index(index, os.path.join(tmp, 'index.faiss'))
+        with open(os.path.join(tmp, 'texts.json'), 'w', encoding='utf-8') as f:
+            json.dump(texts, f)
+
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # Another worker finished the same build first.
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _load(self, sha256, etag):
+        import faiss  # type: ignore
+
+        build_id = self._build_id(sha256)
+        path = self._index_path(build_id)
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP)
+        except RuntimeError:
+            index = faiss.read_index(path)
+        with open(os.path.join(self.index_dir, build_id, 'texts.json'), encoding='utf-8') as f:
+            texts = json.load(f)
+
+        with self._lock:
+            self._index, self._texts = index, texts
+            self._sha256, self._etag = sha256, etag
+        self._ready.set()
+
+    def _remote_etag(self):
+        try:
+            with track_stage("supabase"):
+                files = supabase_client.storage.from_(RAG_BUCKET).list()
+            for item in files:
+                if item.get('name') == RAG_FILE:
+                    return (item.get('metadata') or {}).get('eTag')
+        except Exception as e:
+            logger.warning(f"Could not check {RAG_FILE} ETag: {e}")
+        return None
+
+    def _build_id(self, sha256):
+        settings = f"{sha256}:{self.backend}:{self.embeddings.model_name}:{self.quantization}"
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def _index_path(self, build_id):
+        return os.path.join(self.index_dir, build_id, 'index.faiss')
+
+    def _manifest_path(self):
+        return os.path.join(self.index_dir, 'current.json')
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, sha256, etag):
+        os.makedirs(self.index_dir, exist_ok=True)
+        tmp = f"{self._manifest_path()}.tmp-{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({"sha256": sha256, "etag": etag, "build": self._build_id(sha256)}, f)
+        os.replace(tmp, self._manifest_path())
+
+
+best_practices_index = BestPracticesIndex()
@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from app.background import PeriodicTask
+from app.config import Config
+from app.metrics import timed
+from app.supabase_client import supabase_client
+
+logger = logging.getLogger(__name__)
+
+
+class ReferenceDataCache:
+    """Domains, rounds and interview rules kept in memory for session start."""
+
+    def __init__(self, ttl_seconds=Config.REFERENCE_DATA_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._domains = {}
+        self._rounds = {}
+        self._rules = {}
+        self._loaded_at = None
+        self.hits = 0
+        self.misses = 0
+        self._refresher = PeriodicTask("reference-data-refresh", ttl_seconds, self.refresh, run_immediately=False)
+
+    def start(self):
+        # The first load happens in the warm-up phase, or on the first lookup miss.
+        self._refresher.start()
+
+    @property
+    def loaded(self):
+        return self._loaded_at is not None
+
+    def stop(self):
+        self._refresher.stop()
+
+    @timed("supabase")
+    def refresh(self):
+        domains = supabase_client.table("domains").select("id, name").execute().data
+        rounds = supabase_client.table("rounds").select("id, name").execute().data
+        rules = supabase_client.table("interview_rules").select("domain_id, round_id, rule_content").execute().data
+
+        with self._lock:
+            self._domains = {row["name"]: row["id"] for row in domains}
+            self._rounds = {row["name"]: row["id"] for row in rounds}
+            self._rules = {(row["domain_id"], row["round_id"]): {"rule_content": row["rule_content"]} for row in rules}
+            self._loaded_at = time.time()
+
+    def invalidate(self):
+        self.refresh()
+
+    def domain_id(self, name):
+        return self._lookup(lambda: self._domains.get(name))
+
+    def round_id(self, name):
+        return self._lookup(lambda: self._rounds.get(name))
+
+    def rules(self, domain_id, round_id):
+        return self._lookup(lambda: self._rules.get((domain_id, round_id)))
+
+    def _lookup(self, read):
+        with self._lock:
+            value = read()
+        if value is None and self._staleness() >= Config.REFERENCE_DATA_MISS_REFRESH_SECONDS:
+            # Unknown names may have been added since the last refresh.
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Could not refresh reference data: {e}")
+            with self._lock:
+                value = read()
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def _staleness(self):
+        return float('inf') if self._loaded_at is None else time.time() - self._loaded_at
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "loaded_at": self._loaded_at,
+                "staleness_seconds": None if self._loaded_at is None else time.time() - self._loaded_at,
+                "ttl_seconds": self.ttl_seconds,
+                "domains": len(self._domains),
+                "rounds": len(self._rounds),
+                "rules": len(self._rules),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+            }
+
+
+reference_data = ReferenceDataCache()
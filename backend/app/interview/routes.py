@@ -1,22 +1,31 @@
+import logging
 from flask import Blueprint, request, jsonify  # type: ignore
-from .utils import extract_text_from_pdf,problems_DS,problems_SDE
-from app.supabase_client import supabase_client
+from .utils import problems_DS,problems_SDE
+from app.pdf_extraction import extract_text_from_pdf, PdfExtractionError
 from datetime import datetime
 import json
-from app.redis_client import redis_client
-from dotenv import load_dotenv
-import io
-import os
-from langchain_google_genai import GoogleGenerativeAIEmbeddings # type: ignore
-import pandas as pd
-from langchain_core.documents import Document  # type: ignore
-from langchain_community.vectorstores import FAISS # type: ignore
-from google.oauth2 import service_account # type: ignore
-import google.generativeai as genai  # type: ignore
+import uuid
+from app.llm_gateway import llm_gateway
+from .rag_index import best_practices_index
+from .reference_data import reference_data
+from .session_store import (create_session, load_session, append_messages, delete_session,
+                            claim_idempotency_key, complete_idempotency_key, release_idempotency_key,
+                            SessionConflictError)
+from .context import build_prompt_context, estimate_tokens, history_window, schedule_summary_refresh
+from .streaming import wants_stream, sse_event, sse_response, stream_completion
+from app.auth.utils import require_auth
+
+logger = logging.getLogger(__name__)
 
 interview_bp = Blueprint('interview', __name__)
 
+# Approximate size of the fixed next_question instructions.
+PROMPT_INSTRUCTION_TOKENS = 600
+CONCLUDE_SENTINEL = "conclude"
+CONCLUSION_MESSAGE = "Thank you so much for taking the time to talk with us today. We really enjoyed learning more about your background and the skills you bring to the role. We'll review everything and be in touch soon about the next steps. If you have any questions in the meantime, feel free to reach out. Have a great day!"
+
 @interview_bp.route('/initialize', methods=['POST'])
+@require_auth
 def initialize_interview():
     data = request.form
     domain = data.get('domain').strip()
@@ -28,24 +37,25 @@ def initialize_interview():
     if not resume.filename.endswith('.pdf'):
         return jsonify({"error": "Invalid file format, only PDFs are allowed"}), 400
     
-    resume_text = extract_text_from_pdf(resume)
+    try:
+        resume_text = extract_text_from_pdf(resume)
+    except PdfExtractionError as e:
+        return jsonify({"error": str(e)}), 400
 
-    response = supabase_client.table("domains").select("id").eq("name", domain).execute()
-    if not response.data:
+    domain_id = reference_data.domain_id(domain)
+    if domain_id is None:
         return jsonify({"error": f"No domain found for {domain}"}), 404
-    domain_id = response.data[0]["id"]
 
-    response = supabase_client.table("rounds").select("id").eq("name", interview_type).execute()
-    if not response.data:
+    round_id = reference_data.round_id(interview_type)
+    if round_id is None:
         return jsonify({"error": f"No round found for {interview_type}"}), 404
-    round_id = response.data[0]["id"]
 
-    response = supabase_client.table("interview_rules").select("rule_content").eq("domain_id", domain_id).eq("round_id", round_id).execute()
-    if not response.data:
+    interview_rules = reference_data.rules(domain_id, round_id)
+    if interview_rules is None:
         return jsonify({"error": "No rules found for the selected domain and type"}), 404
-    interview_rules = response.data[0]
 
-    session_id = f"{domain}_{interview_type}_{resume.filename.split('.')[0]}"
+    # Random ids: two candidates uploading "resume.pdf" must not share a session.
+    session_id = uuid.uuid4().hex
 
     if interview_type == "TECHNICAL_1":
         problems = problems_SDE()
@@ -57,21 +67,21 @@ def initialize_interview():
         "type": interview_type,
         "resume": resume_text,
         "rules": interview_rules,
-        "chat_history": [
-            {"role": "system", "content": "Hi I am Alice. I am your interviewer today. Could you please introduce yourself?"}
-        ],
         "start_time": datetime.now().isoformat() 
     }
     if 'problems' in locals() and problems:
         session_data["problems"] = problems 
 
-    session_data_str = json.dumps(session_data)
+    chat_history = [
+        {"role": "system", "content": "Hi I am Alice. I am your interviewer today. Could you please introduce yourself?"}
+    ]
 
-    redis_client.hset(session_id, "session_data", session_data_str)
+    create_session(session_id, session_data, chat_history)
 
-    return jsonify({"session_id": session_id, "interviewer_response": session_data["chat_history"]}), 200
+    return jsonify({"session_id": session_id, "interviewer_response": chat_history}), 200
 
 @interview_bp.route('/next_question', methods=['POST'])
+@require_auth
 def next_question():
     data = request.form
     session_id = data.get('session_id')
@@ -80,23 +90,44 @@ def next_question():
     if not session_id or not user_answer:
         return jsonify({"error": "Missing session ID or user answer"}), 400
 
-    redis_key_type = redis_client.type(session_id)
-    if redis_key_type != 'hash':
-        return jsonify({"error": "Invalid Redis key type. Expected hash."}), 400
-
-    session_data_str = redis_client.hget(session_id, 'session_data')
+    try:
+        session_data = load_session(session_id, history_window())
+    except json.JSONDecodeError:
+        return jsonify({"error": "Error decoding session data"}), 500
 
-    if session_data_str is None:
+    if session_data is None:
         return jsonify({"error": "Invalid session ID or missing session data"}), 404
-    if isinstance(session_data_str, bytes):
-        session_data_str = session_data_str.decode('utf-8')
+
+    # A retried answer with the same key replays the first result instead of calling the LLM again.
+    idempotency_key = data.get('idempotency_key') or request.headers.get('Idempotency-Key')
+    if idempotency_key:
+        previous = claim_idempotency_key(session_id, idempotency_key)
+        if previous is not None:
+            if previous["state"] != "done":
+                return jsonify({"error": "This answer is still being processed"}), 409
+            if wants_stream(request):
+                return sse_response(iter([sse_event(previous["event"], previous["body"])]))
+            return jsonify(previous["body"]), previous["status"]
+
+    def remember(status, event, body):
+        if idempotency_key:
+            complete_idempotency_key(session_id, idempotency_key, {"status": status, "event": event, "body": body})
+
+    def forget():
+        if idempotency_key:
+            release_idempotency_key(session_id, idempotency_key)
 
     try:
-        session_data = json.loads(session_data_str)
-    except json.JSONDecodeError:
-        return jsonify({"error": "Error decoding session data"}), 500
+        return _follow_up(session_id, session_data, user_answer, remember, forget)
+    except Exception as e:
+        # Whatever fails after the claim (retrieval, prompt context) must not leave it pending.
+        forget()
+        logger.error(f"Error occurred while preparing follow-up: {e}")
+        return jsonify({"error": "No follow-up available"}), 500
 
-    session_data["chat_history"].append({"role": "user", "content": user_answer})
+def _follow_up(session_id, session_data, user_answer, remember, forget):
+    user_message = {"role": "user", "content": user_answer}
+    session_data["chat_history"].append(user_message)
     start_time = session_data.get('start_time')
     elapsed_time = (datetime.now() - datetime.fromisoformat(start_time)).total_seconds() / 60
     # if elapsed_time > 50:
@@ -104,76 +135,23 @@ def next_question():
     #     return jsonify({"message": conclusion_message, "status_code": 408, "session_id": session_id}), 408
 
     interview_info = session_data["rules"]
-    chat_history = session_data["chat_history"]
-    resume_text = session_data["resume"]
     interview_type = session_data["type"]
 
     if "problems" in session_data:
         problems = session_data["problems"]
     else:
         problems = None
-    print(problems)
-    try:
-        best_practices_file = supabase_client.storage.from_('ragfiles').download('answers_followup_questions.csv')
-        best_practices_file = io.BytesIO(best_practices_file)
-    except Exception as e:
-        print('Error:', e)
+    logger.debug(f"Session problems: {problems}")
+    best_practice = best_practices_index.search(user_answer, k=3)
 
-    load_dotenv()
-
-    embeddings = None
-    credentials_json = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
+    reserved_tokens = PROMPT_INSTRUCTION_TOKENS + estimate_tokens(interview_info) + estimate_tokens(best_practice) + estimate_tokens(user_answer)
+    if problems != None:
+        reserved_tokens += estimate_tokens(problems)
+    context = build_prompt_context(session_data, reserved_tokens)
+    conversation_summary = context["summary"]
+    chat_history = context["chat_history"]
+    resume_text = context["resume"]
 
-    if credentials_json:
-        credentials_dict = json.loads(credentials_json)
-        credentials = service_account.Credentials.from_service_account_info(credentials_dict)
-        embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", credentials=credentials)
-    else:
-        raise Exception("Service account credentials not found in environment variables")
-
-    df = pd.read_csv(best_practices_file)
-    texts = df[['Answer', 'Follow-Up Question']].agg(' '.join, axis=1).tolist()
-    documents = [Document(page_content=text) for text in texts]
-
-    db = FAISS.from_documents(documents, embeddings)
-#     load_dotenv()
-
-#     embeddings = None
-# # Fetch the JSON string from the environment variable
-#     credentials_json = os.getenv("GOOGLE_APPLICATION_CREDENTIALS_JSON")
-
-#     if credentials_json:
-#         # Parse the JSON string into a dictionary
-#         credentials_dict = json.loads(credentials_json)
-        
-#         # Use the dictionary to create credentials
-#         credentials = service_account.Credentials.from_service_account_info(credentials_dict)
-
-#         # Set the credentials as the default credentials
-#         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_json  # Optional, for other clients
-        
-#         # Initialize the Google Cloud client with the credentials
-#         embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", credentials=credentials)
-
-#     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = r"D://Hackathons//CODERED'25//PREP2PRO//backend_prep2pro//gcpserviceacckey.json"
-#     embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001")
-#     df = pd.read_csv(best_practices_file)
-#     texts = df[['Answer', 'Follow-Up Question']].agg(' '.join, axis=1).tolist()
-#     documents = [Document(page_content=text) for text in texts]
-#     db = FAISS.from_documents(documents, embeddings)
-
-    def retrieve_info(query):
-        similar_response = db.similarity_search(query, k=3)
-        page_contents_array = [doc.page_content for doc in similar_response]
-        return page_contents_array
-
-    best_practice = retrieve_info(user_answer)
-
-    load_dotenv()
-    GEMINI_KEY = os.getenv('GEMINI_KEY')
-    genai.configure(api_key=GEMINI_KEY)
-    gemini_model = genai.GenerativeModel("gemini-1.5-flash")
-    
     prompt = f'''
     You are a world-class interviewer with expertise in various technical domains. Your task is to frame a highly specific technical follow-up question based on the provided resources and context.
     
@@ -181,7 +159,8 @@ def next_question():
     Interview Structure and Rules: {interview_info}
     Best Practices for Question Framing: {best_practice}
     Ensure questions align with the formal style provided, keeping them concise yet detailed where necessary.
-    Chat History of the Interview So Far: {chat_history}
+    Summary of the Earlier Interview: {conversation_summary}
+    Most Recent Chat History of the Interview: {chat_history}
     This is the user's answer to your previous question : {user_answer}
     This is the user' resume :{resume_text}
     Current duration of the interview : {elapsed_time}
@@ -205,27 +184,48 @@ def next_question():
     '''
     if problems != None:
         prompt += f'''Here are the problems use should be including in this session{problems}'''
+
+    def save_question(question):
+        append_messages(session_id, user_message, {"role": "interviewer", "content": question},
+                        expected_version=session_data["version"])
+        schedule_summary_refresh(session_id, session_data["history_length"] + 2, session_data.get("summary_upto", 0))
+        result = {"question": question}
+        remember(200, "done", result)
+        return result
+
+    def conclusion():
+        result = {"message": CONCLUSION_MESSAGE, "status_code": 408, "session_id": session_id}
+        remember(408, "conclude", result)
+        return result
+
+    def failed(error):
+        forget()
+        if isinstance(error, SessionConflictError):
+            return {"error": str(error), "status_code": 409}
+        return None
+
+    if wants_stream(request):
+        chunks = llm_gateway.stream(prompt, "interview.next_question")
+        return sse_response(stream_completion(chunks, save_question, conclusion, sentinel=CONCLUDE_SENTINEL, on_error=failed))
+
     try:
-        response = gemini_model.generate_content(prompt)
+        question = llm_gateway.generate(prompt, "interview.next_question")
     except Exception as e:
-        print(f"Error occurred while fetching follow-up: {e}")
+        forget()
+        logger.error(f"Error occurred while fetching follow-up: {e}")
         return jsonify({"error": "No follow-up available"}), 500
 
-    question = response.text
-
-    if "conclude" in question:
-        conclusion_message = "Thank you so much for taking the time to talk with us today. We really enjoyed learning more about your background and the skills you bring to the role. We'll review everything and be in touch soon about the next steps. If you have any questions in the meantime, feel free to reach out. Have a great day!"
-        return jsonify({"message": conclusion_message, "status_code": 408, "session_id": session_id}), 408
-    
-    session_data["chat_history"].append({"role": "interviewer", "content": question})
-
-    session_data_str = json.dumps(session_data)
+    if CONCLUDE_SENTINEL in question:
+        return jsonify(conclusion()), 408
 
-    redis_client.hset(session_id, 'session_data', session_data_str)
-
-    return jsonify({"question": question}), 200
+    try:
+        return jsonify(save_question(question)), 200
+    except SessionConflictError as e:
+        forget()
+        return jsonify({"error": str(e)}), 409
 
 @interview_bp.route('/improvements', methods=['POST'])
+@require_auth
 def generate_improvements():
     data = request.form
     session_id = data.get('session_id')
@@ -233,36 +233,45 @@ def generate_improvements():
     if not session_id:
         return jsonify({"error": "Missing session ID"}), 400
 
-    session_data_str = redis_client.hget(session_id, 'session_data')
-
-    if session_data_str is None:
-        return jsonify({"error": "Invalid session ID or missing session data"}), 404
-    if isinstance(session_data_str, bytes):
-        session_data_str = session_data_str.decode('utf-8')
-
     try:
-        session_data = json.loads(session_data_str)
+        session_data = load_session(session_id)
     except json.JSONDecodeError:
         return jsonify({"error": "Error decoding session data"}), 500
 
-    chat_history = session_data["chat_history"]
-    load_dotenv()
-    GEMINI_KEY = os.getenv('GEMINI_KEY')
-    genai.configure(api_key=GEMINI_KEY)
-    gemini_model = genai.GenerativeModel("gemini-1.5-flash")
+    if session_data is None:
+        return jsonify({"error": "Invalid session ID or missing session data"}), 404
 
+    chat_history = session_data["chat_history"]
     prompt = f'''
     You are an expert interviewer. Based on the following chat history, provide detailed and constructive improvement suggestions for the user in bullet points:
     {chat_history}
     '''
 
+    def save_improvements(improvements):
+        delete_session(session_id)
+        return {"improvements": improvements}
+
+    if wants_stream(request):
+        return sse_response(stream_completion(llm_gateway.stream(prompt, "interview.improvements"), save_improvements))
+
     try:
-        response = gemini_model.generate_content(prompt)
-        improvements = response.text
+        improvements = llm_gateway.generate(prompt, "interview.improvements")
     except Exception as e:
-        print(f"Error occurred while generating improvements: {e}")
+        logger.error(f"Error occurred while generating improvements: {e}")
         return jsonify({"error": "Could not generate improvements"}), 500
 
-    redis_client.delete(session_id)
+    return jsonify(save_improvements(improvements)), 200
+
+@interview_bp.route('/reference_data', methods=['GET'])
+def reference_data_stats():
+    return jsonify(reference_data.stats()), 200
 
-    return jsonify({"improvements": improvements}), 200
\ No newline at end of file
+@interview_bp.route('/reference_data/refresh', methods=['POST'])
+@require_auth
+def refresh_reference_data():
+    try:
+        reference_data.invalidate()
+    except Exception as e:
+        logger.error(f"Error occurred while refreshing reference data: {e}")
+        return jsonify({"error": "Could not refresh reference data"}), 500
+    return jsonify(reference_data.stats()), 200
@@ -0,0 +1,29 @@
+import json
+import zlib
+import msgpack  # type: ignore
+from app.config import Config
+
+# One tag byte in front of every value says how the rest is encoded.
+PACKED = b"m"
+COMPRESSED = b"z"
+
+
+def encode(value, compress_bytes=Config.INTERVIEW_SESSION_COMPRESS_BYTES):
+    """msgpack, zlib-compressed when larger than compress_bytes (resume text, problem HTML)."""
+    packed = msgpack.packb(value, use_bin_type=True)
+    if len(packed) > compress_bytes:
+        compressed = zlib.compress(packed, 6)
+        if len(compressed) < len(packed):
+            return COMPRESSED + compressed
+    return PACKED + packed
+
+def decode(data):
+    if data is None:
+        return None
+    tag, body = data[:1], data[1:]
+    if tag == COMPRESSED:
+        return msgpack.unpackb(zlib.decompress(body), raw=False)
+    if tag == PACKED:
+        return msgpack.unpackb(body, raw=False)
+    # Sessions written before the codec existed are plain JSON.
+    return json.loads(data)
@@ -0,0 +1,183 @@
+import logging
+import redis
+from app.background import PeriodicTask
+from app.config import Config
+from app.redis_client import redis_binary_client
+from app.metrics import INTERVIEW_SESSION_BYTES, INTERVIEW_SESSION_KEYS, timed
+from .session_codec import decode, encode
+
+logger = logging.getLogger(__name__)
+
+SESSION_PREFIX = "interview:"
+IDEMPOTENCY_PENDING = {"state": "pending"}
+
+
+class SessionConflictError(Exception):
+    pass
+
+
+def _session_key(session_id):
+    return f"{SESSION_PREFIX}{session_id}"
+
+def _history_key(session_id):
+    return f"{SESSION_PREFIX}{session_id}:history"
+
+def _idempotency_key(session_id, key):
+    return f"{SESSION_PREFIX}{session_id}:idem:{key}"
+
+def _touch(pipe, session_id, ttl=Config.INTERVIEW_SESSION_TTL_SECONDS):
+    # Sliding expiry: every turn pushes it back, abandoned interviews just expire.
+    pipe.expire(_session_key(session_id), ttl)
+    pipe.expire(_history_key(session_id), ttl)
+
+@timed("redis")
+def create_session(session_id, static_fields, chat_history):
+    # Static fields are written once; only the history list and the version change per turn.
+    pipe = redis_binary_client.pipeline(transaction=True)
+    pipe.delete(_session_key(session_id), _history_key(session_id))
+    fields = {key: encode(value) for key, value in static_fields.items()}
+    fields["version"] = 0
+    pipe.hset(_session_key(session_id), mapping=fields)
+    if chat_history:
+        pipe.rpush(_history_key(session_id), *[encode(message) for message in chat_history])
+    _touch(pipe, session_id)
+    pipe.execute()
+
+@timed("redis")
+def load_session(session_id, history_window=None):
+    pipe = redis_binary_client.pipeline(transaction=False)
+    pipe.hgetall(_session_key(session_id))
+    pipe.lrange(_history_key(session_id), -history_window if history_window else 0, -1)
+    pipe.llen(_history_key(session_id))
+    _touch(pipe, session_id)
+    static_fields, chat_history, history_length = pipe.execute()[:3]
+
+    if not static_fields:
+        return None
+
+    # The version is a plain integer so HINCRBY can bump it.
+    version = int(static_fields.pop(b"version", 0))
+    session_data = {key.decode(): decode(value) for key, value in static_fields.items()}
+    session_data["version"] = version
+    session_data["chat_history"] = [decode(message) for message in chat_history]
+    session_data["history_length"] = history_length
+    session_data["history_offset"] = history_length - len(chat_history)
+    return session_data
+
+@timed("redis")
+def load_summary_state(session_id, upto):
+    summary, summary_upto = redis_binary_client.hmget(_session_key(session_id), "summary", "summary_upto")
+    summary = decode(summary) or ""
+    summary_upto = decode(summary_upto) or 0
+    if summary_upto >= upto:
+        return summary, summary_upto, []
+    messages = redis_binary_client.lrange(_history_key(session_id), summary_upto, upto - 1)
+    return summary, summary_upto, [decode(message) for message in messages]
+
+@timed("redis")
+def update_summary(session_id, summary, upto):
+    if not redis_binary_client.exists(_session_key(session_id)):
+        return
+    pipe = redis_binary_client.pipeline(transaction=True)
+    pipe.hset(_session_key(session_id), mapping={"summary": encode(summary), "summary_upto": encode(upto)})
+    _touch(pipe, session_id)
+    pipe.execute()
+
+@timed("redis")
+def append_messages(session_id, *messages, expected_version=None, attempts=5):
+    """Appends one turn and bumps the session version, returning the new version.
+
+    With expected_version the write is optimistic: the session hash is WATCHed
+    and SessionConflictError is raised if another turn was saved since that
+    version was loaded, or if the session is gone. The summarizer and TTL
+    refreshes also touch the hash, so a WATCH abort is retried as long as
+    the version still matches.
+    """
+    key = _session_key(session_id)
+    encoded = [encode(message) for message in messages]
+    with redis_binary_client.pipeline(transaction=True) as pipe:
+        for _ in range(attempts):
+            try:
+                if expected_version is not None:
+                    pipe.watch(key)
+                    version = pipe.hget(key, "version")
+                    if version is None and not pipe.exists(key):
+                        raise SessionConflictError("The interview session has ended or expired")
+                    if int(version or 0) != expected_version:
+                        raise SessionConflictError("Another answer was saved for this interview first")
+                    pipe.multi()
+                pipe.rpush(_history_key(session_id), *encoded)
+                pipe.hincrby(key, "version", 1)
+                _touch(pipe, session_id)
+                return pipe.execute()[1]
+            except redis.WatchError:
+                pipe.reset()
+    raise SessionConflictError("The interview session is too busy, please retry")
+
+@timed("redis")
+def delete_session(session_id):
+    redis_binary_client.delete(_session_key(session_id), _history_key(session_id))
+
+
+@timed("redis")
+def claim_idempotency_key(session_id, key, ttl=Config.INTERVIEW_IDEMPOTENCY_PENDING_SECONDS):
+    """Returns None if this request may run, else the earlier request's record.
+
+    A claim expires after ttl, so a request that died mid-way does not block
+    retries for the lifetime of the session.
+    """
+    if redis_binary_client.set(_idempotency_key(session_id, key), encode(IDEMPOTENCY_PENDING), nx=True, ex=ttl):
+        return None
+    return decode(redis_binary_client.get(_idempotency_key(session_id, key))) or IDEMPOTENCY_PENDING
+
+@timed("redis")
+def complete_idempotency_key(session_id, key, record, ttl=Config.INTERVIEW_SESSION_TTL_SECONDS):
+    redis_binary_client.set(_idempotency_key(session_id, key), encode(dict(record, state="done")), ex=ttl)
+
+@timed("redis")
+def release_idempotency_key(session_id, key):
+    redis_binary_client.delete(_idempotency_key(session_id, key))
+
+
+def session_memory_report(sample_size=Config.INTERVIEW_MEMORY_REPORT_SAMPLE):
+    """Counts the session keyspace and estimates its memory from a sample of MEMORY USAGE calls.
+
+    SCAN keeps this non-blocking; only the first sample_size keys are measured
+    and the total is extrapolated from their average.
+    """
+    counts = {"session": 0, "history": 0, "idempotency": 0}
+    sampled_bytes, sampled = 0, 0
+    for key in redis_binary_client.scan_iter(match=f"{SESSION_PREFIX}*", count=500):
+        if key.endswith(b":history"):
+            counts["history"] += 1
+        elif b":idem:" in key:
+            counts["idempotency"] += 1
+        else:
+            counts["session"] += 1
+        if sampled < sample_size:
+            try:
+                usage = redis_binary_client.memory_usage(key)
+            except redis.ResponseError:
+                # MEMORY USAGE is unavailable (e.g. fakeredis); report counts only.
+                sample_size, usage = 0, None
+            if usage is not None:
+                sampled_bytes += usage
+                sampled += 1
+
+    total_keys = sum(counts.values())
+    estimated_bytes = int(sampled_bytes / sampled * total_keys) if sampled else 0
+    for kind, count in counts.items():
+        INTERVIEW_SESSION_KEYS.labels(kind).set(count)
+    INTERVIEW_SESSION_BYTES.set(estimated_bytes)
+
+    report = {
+        "sessions": counts["session"],
+        "keys": total_keys,
+        "estimated_bytes": estimated_bytes,
+        "bytes_per_session": estimated_bytes // counts["session"] if counts["session"] else 0,
+        "sampled_keys": sampled,
+    }
+    logger.info(f"Interview session keyspace: {report}")
+    return report
+
+memory_reporter = PeriodicTask("interview-session-memory", Config.INTERVIEW_MEMORY_REPORT_SECONDS, session_memory_report)
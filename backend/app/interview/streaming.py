@@ -0,0 +1,71 @@
+import json
+import logging
+from flask import Response, stream_with_context  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def wants_stream(request):
+    if request.form.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return 'text/event-stream' in request.headers.get('Accept', '')
+
+def sse_response(events):
+    return Response(
+        stream_with_context(events),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _could_be_sentinel(text, sentinel):
+    text = text.strip().lower()
+    return sentinel.startswith(text) or text.startswith(sentinel)
+
+def _error_event(on_error, error, message):
+    data = on_error(error) if on_error else None
+    return sse_event("error", data or {"error": message})
+
+def stream_completion(chunks, on_complete, on_sentinel=None, sentinel=None, on_error=None):
+    """Turns an iterable of text chunks into SSE events.
+
+    While the reply could still be the sentinel, chunks are held back so a
+    bare sentinel is never shown to the user. When the stream finishes,
+    on_sentinel() or on_complete(full_text) provides the final event data.
+    If streaming or saving fails, on_error(exception) may supply the error
+    event's data.
+    """
+    parts = []
+    pending = ""
+    holding = sentinel is not None
+
+    try:
+        for text in chunks:
+            if not text:
+                continue
+            parts.append(text)
+            pending += text
+            if holding and _could_be_sentinel(pending, sentinel):
+                continue
+            holding = False
+            yield sse_event("token", {"text": pending})
+            pending = ""
+    except Exception as e:
+        logger.error(f"Error occurred while streaming completion: {e}")
+        yield _error_event(on_error, e, "Streaming interrupted")
+        return
+
+    full_text = "".join(parts)
+    if sentinel is not None and sentinel in full_text:
+        yield sse_event("conclude", on_sentinel())
+        return
+
+    if pending:
+        yield sse_event("token", {"text": pending})
+    try:
+        yield sse_event("done", on_complete(full_text))
+    except Exception as e:
+        logger.error(f"Error occurred while finishing streamed completion: {e}")
+        yield _error_event(on_error, e, "Could not save response")
@@ -1,21 +1,16 @@
-import PyPDF2 # type: ignore
+import logging
 import random
 from app.supabase_client import supabase_client
 import requests
+from app.config import Config
+from app.metrics import timed, track_stage
+from .problem_catalog import ProblemCatalog
 
-def extract_text_from_pdf(pdf_file):
-    try:
-        reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text()
-        
-        return text
+logger = logging.getLogger(__name__)
 
-    except Exception as e:
-        return f"Error in PDF extraction: {str(e)}"
-    
+leetcode_session = requests.Session()
+
+@timed("leetcode")
 def fetch_problem_details(title_slug):
     query = f"""
     {{
@@ -29,9 +24,10 @@ def fetch_problem_details(title_slug):
     """
 
     url = "https://leetcode.com/graphql/"
-    response = requests.post(
+    response = leetcode_session.post(
         url,
-        json={'query': query}
+        json={'query': query},
+        timeout=Config.LEETCODE_TIMEOUT_SECONDS
     )
 
     if response.status_code == 200:
@@ -39,8 +35,20 @@ def fetch_problem_details(title_slug):
         return data
     
     else:
-        print(f"Request failed with status code {response.status_code}")
+        logger.error(f"Request failed with status code {response.status_code}")
         return None
+
+problem_catalog = ProblemCatalog(fetch_problem_details)
+
+def get_problem(problem_id):
+    problem = problem_catalog.get(problem_id)
+    if problem is not None:
+        return problem
+
+    # Not in the snapshot yet (cold start or a newly added problem).
+    with track_stage("supabase"):
+        response = supabase_client.table("problems").select("name").eq("id", problem_id).execute()
+    return fetch_problem_details(response.data[0]["name"])
        
 def problems_SDE():
     count = [[1,1,0],[1,0,1],[0,2,0],[0,1,1]]
@@ -61,12 +69,8 @@ def problems_SDE():
         rand1 = random.randint(1,26)
         rand2 = random.randint(41,50)
     
-    response1 = supabase_client.table("problems").select("name").eq("id", rand1).execute()
-    response2 = supabase_client.table("problems").select("name").eq("id", rand2).execute()
-
-    pb1,pb2 = response1.data[0]["name"],response2.data[0]["name"]
-    pb1 = fetch_problem_details(pb1)
-    pb2 = fetch_problem_details(pb2)
+    pb1 = get_problem(rand1)
+    pb2 = get_problem(rand2)
     return [pb1,pb2] 
 
 def problems_DS():
@@ -80,8 +84,5 @@ def problems_DS():
     else:
         rand = random.randint(1,26)
     
-    response = supabase_client.table("problems").select("name").eq("id", rand).execute()
-
-    pb = response.data[0]["name"]
-    pb = fetch_problem_details(pb)
+    pb = get_problem(rand)
     return pb
\ No newline at end of file
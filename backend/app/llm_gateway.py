@@ -0,0 +1,259 @@
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from app.config import Config
+from app.metrics import track_stage, record_llm_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class LLMTimeoutError(Exception):
+    pass
+
+
+class LLMResult:
+    def __init__(self, text, prompt_tokens=None, completion_tokens=None):
+        self.text = text
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+
+
+class LLMStream:
+    """Iterable of text chunks; token counts are filled in once it is exhausted."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.prompt_tokens = None
+        self.completion_tokens = None
+
+    def __iter__(self):
+        return self._chunks(self)
+
+
+def _estimate_tokens(text):
+    return len(text) // 4 + 1
+
+
+class GeminiBackend:
+    def __init__(self, model_name=Config.LLM_MODEL):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    import google.generativeai as genai  # type: ignore
+                    load_dotenv()
+                    genai.configure(api_key=os.getenv('GEMINI_KEY'))
+                    self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    def transient_errors(self):
+        from google.api_core import exceptions  # type: ignore
+        return (
+            exceptions.ServiceUnavailable,
+            exceptions.TooManyRequests,
+            exceptions.ResourceExhausted,
+            exceptions.DeadlineExceeded,
+            exceptions.InternalServerError,
+            ConnectionError,
+            TimeoutError,
+        )
+
+    def generate(self, prompt, timeout, generation_config=None):
+        response = self.model.generate_content(prompt, generation_config=generation_config, request_options={"timeout": timeout})
+        usage = getattr(response, 'usage_metadata', None)
+        return LLMResult(
+            response.text,
+            getattr(usage, 'prompt_token_count', None),
+            getattr(usage, 'candidates_token_count', None),
+        )
+
+    def stream(self, prompt, timeout, generation_config=None):
+        response = self.model.generate_content(prompt, generation_config=generation_config, stream=True, request_options={"timeout": timeout})
+
+        def chunks(stream):
+            for chunk in response:
+                yield chunk.text
+            usage = getattr(response, 'usage_metadata', None)
+            stream.prompt_tokens = getattr(usage, 'prompt_token_count', None)
+            stream.completion_tokens = getattr(usage, 'candidates_token_count', None)
+
+        return LLMStream(chunks)
+
+
+class FakeBackend:
+    """Offline backend with deterministic replies and configurable latency.
+
+    `responder` may be a string or a callable taking the prompt. Streaming
+    splits the reply into `chunk_size` character chunks spread over the
+    latency.
+    """
+
+    def __init__(self, responder=None, latency=Config.LLM_FAKE_LATENCY_SECONDS, chunk_size=16, failures=0):
+        self.responder = responder or "Thank you. Could you explain the trade-offs of the approach you described?"
+        self.latency = latency
+        self.chunk_size = chunk_size
+        # Number of upcoming calls that raise a transient error, for exercising retries.
+        self.failures = failures
+        self._lock = threading.Lock()
+
+    def transient_errors(self):
+        return (ConnectionError, TimeoutError)
+
+    def _reply(self, prompt):
+        with self._lock:
+            if self.failures > 0:
+                self.failures -= 1
+                raise ConnectionError("Fake transient failure")
+        return self.responder(prompt) if callable(self.responder) else self.responder
+
+    def generate(self, prompt, timeout, generation_config=None):
+        text = self._reply(prompt)
+        if self.latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("Fake backend timed out")
+        time.sleep(self.latency)
+        return LLMResult(text, _estimate_tokens(prompt), _estimate_tokens(text))
+
+    def stream(self, prompt, timeout, generation_config=None):
+        text = self._reply(prompt)
+        pieces = [text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size)] or [""]
+
+        def chunks(stream):
+            for piece in pieces:
+                time.sleep(self.latency / len(pieces))
+                yield piece
+            stream.prompt_tokens = _estimate_tokens(prompt)
+            stream.completion_tokens = _estimate_tokens(text)
+
+        return LLMStream(chunks)
+
+
+def _create_backend(name):
+    if name == 'fake':
+        return FakeBackend()
+    if name == 'gemini':
+        return GeminiBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+class LLMGateway:
+    def __init__(self, backend=None, max_concurrency=Config.LLM_MAX_CONCURRENCY, max_retries=Config.LLM_MAX_RETRIES,
+                 timeout=Config.LLM_TIMEOUT_SECONDS, retry_base=Config.LLM_RETRY_BASE_SECONDS):
+        self._backend = backend
+        self._backend_lock = threading.Lock()
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.retry_base = retry_base
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            with self._backend_lock:
+                if self._backend is None:
+                    self._backend = _create_backend(Config.LLM_BACKEND)
+        return self._backend
+
+    def set_backend(self, backend):
+        with self._backend_lock:
+            self._backend = backend
+
+    def warm_up(self):
+        # Imports and configures the client library before the first request needs it.
+        getattr(self.backend, "model", None)
+
+    def generate(self, prompt, call_site, timeout=None, generation_config=None):
+        deadline = time.monotonic() + (timeout or self.timeout)
+        result = self._with_retries(call_site, deadline, lambda remaining: self.backend.generate(prompt, remaining, generation_config))
+        return result.text
+
+    def stream(self, prompt, call_site, timeout=None, generation_config=None):
+        # Only opening the stream is retried; once chunks flow they go straight to the caller.
+        deadline = time.monotonic() + (timeout or self.timeout)
+        started = time.monotonic()
+        stream = self._with_retries(call_site, deadline, lambda remaining: self.backend.stream(prompt, remaining, generation_config), record=False)
+        try:
+            with self._slot(call_site, deadline), track_stage("llm"):
+                for text in stream:
+                    yield text
+        except Exception:
+            self._record(call_site, time.monotonic() - started, error=True)
+            raise
+        self._record(call_site, time.monotonic() - started, stream.prompt_tokens, stream.completion_tokens)
+
+    def _with_retries(self, call_site, deadline, call, record=True):
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                with self._slot(call_site, deadline), track_stage("llm"):
+                    result = call(max(0.001, deadline - time.monotonic()))
+            except Exception as e:
+                self._record(call_site, time.monotonic() - started, error=True)
+                if attempt >= self.max_retries or not isinstance(e, self.backend.transient_errors()):
+                    raise
+                attempt += 1
+                backoff = random.uniform(0, self.retry_base * 2 ** attempt)
+                if time.monotonic() + backoff >= deadline:
+                    raise
+                logger.warning(f"Retrying {call_site} after transient LLM error: {e}")
+                self._record_retry(call_site)
+                time.sleep(backoff)
+                continue
+
+            if record:
+                self._record(call_site, time.monotonic() - started, result.prompt_tokens, result.completion_tokens)
+            return result
+
+    @contextmanager
+    def _slot(self, call_site, deadline):
+        if not self._semaphore.acquire(timeout=max(0, deadline - time.monotonic())):
+            raise LLMTimeoutError(f"Timed out waiting for an LLM slot for {call_site}")
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+
+    def _site_stats(self, call_site):
+        return self._stats.setdefault(call_site, {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "latency_total_seconds": 0.0,
+            "latency_max_seconds": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        })
+
+    def _record(self, call_site, latency, prompt_tokens=None, completion_tokens=None, error=False):
+        with self._stats_lock:
+            stats = self._site_stats(call_site)
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["latency_total_seconds"] += latency
+            stats["latency_max_seconds"] = max(stats["latency_max_seconds"], latency)
+            stats["prompt_tokens"] += prompt_tokens or 0
+            stats["completion_tokens"] += completion_tokens or 0
+        record_llm_tokens(call_site, prompt_tokens, completion_tokens)
+
+    def _record_retry(self, call_site):
+        with self._stats_lock:
+            self._site_stats(call_site)["retries"] += 1
+
+    def stats(self):
+        with self._stats_lock:
+            return {call_site: dict(stats) for call_site, stats in self._stats.items()}
+
+
+llm_gateway = LLMGateway()
@@ -0,0 +1,132 @@
+import contextvars
+import logging
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from flask import Response, g, request  # type: ignore
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest  # type: ignore
+from prometheus_client import multiprocess  # type: ignore
+
+REQUEST_ID_HEADER = "X-Request-ID"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Context variables rather than flask.g so that work handed to executors
+# (see run_in_context) keeps the request id and blueprint label.
+current_request_id = contextvars.ContextVar("request_id", default="-")
+current_blueprint = contextvars.ContextVar("blueprint", default="background")
+
+REQUEST_LATENCY = Histogram(
+    "prep2pro_request_duration_seconds", "HTTP request latency by endpoint.",
+    ["endpoint", "method", "status"], buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "prep2pro_stage_duration_seconds", "Latency of a processing stage, by blueprint.",
+    ["blueprint", "stage"], buckets=LATENCY_BUCKETS,
+)
+STAGE_ERRORS = Counter(
+    "prep2pro_stage_errors_total", "Processing stages that raised, by blueprint.",
+    ["blueprint", "stage"],
+)
+LLM_TOKENS = Counter(
+    "prep2pro_llm_tokens_total", "LLM tokens by call site and kind (prompt or completion).",
+    ["call_site", "kind"],
+)
+# Every worker samples the same keyspace, so multiprocess mode keeps one live value.
+INTERVIEW_SESSION_KEYS = Gauge(
+    "prep2pro_interview_session_keys", "Redis keys under the interview session prefix, by kind.",
+    ["kind"], multiprocess_mode="livemax",
+)
+INTERVIEW_SESSION_BYTES = Gauge(
+    "prep2pro_interview_session_bytes", "Estimated Redis memory used by interview session keys.",
+    multiprocess_mode="livemax",
+)
+
+
+def run_in_context(executor, func, *args):
+    return executor.submit(contextvars.copy_context().run, func, *args)
+
+@contextmanager
+def track_stage(stage):
+    blueprint = current_blueprint.get()
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(blueprint, stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(blueprint, stage).observe(time.perf_counter() - started)
+
+def timed(stage):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with track_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def record_llm_tokens(call_site, prompt_tokens, completion_tokens):
+    if prompt_tokens:
+        LLM_TOKENS.labels(call_site, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(call_site, "completion").inc(completion_tokens)
+
+def _registry():
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+def stage_summary():
+    """Total seconds and count per blueprint/stage, e.g. for benchmark reports."""
+    summary = {}
+    for metric in _registry().collect():
+        if metric.name != "prep2pro_stage_duration_seconds":
+            continue
+        for sample in metric.samples:
+            if sample.name.endswith("_sum") or sample.name.endswith("_count"):
+                key = f"{sample.labels['blueprint']}.{sample.labels['stage']}"
+                field = "seconds" if sample.name.endswith("_sum") else "count"
+                summary.setdefault(key, {"seconds": 0.0, "count": 0})[field] += sample.value
+    return summary
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = current_request_id.get()
+        return True
+
+def configure_logging():
+    handler = logging.StreamHandler()
+    handler.addFilter(RequestIdFilter())
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
+
+def init_app(app):
+    configure_logging()
+
+    @app.before_request
+    def start_request():
+        g.request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        g.request_started = time.perf_counter()
+        current_request_id.set(g.request_id)
+        current_blueprint.set(request.blueprint or "app")
+
+    @app.after_request
+    def finish_request(response):
+        response.headers[REQUEST_ID_HEADER] = g.get("request_id", "")
+        started = g.get("request_started")
+        if started is not None:
+            endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+            REQUEST_LATENCY.labels(endpoint, request.method, response.status_code).observe(time.perf_counter() - started)
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        return Response(generate_latest(_registry()), mimetype=CONTENT_TYPE_LATEST)
@@ -0,0 +1,60 @@
+import hashlib
+import io
+import logging
+import PyPDF2 # type: ignore
+import redis
+from app.config import Config
+from app.metrics import track_stage
+from app.concurrency import run_blocking
+from app.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+PDF_TEXT_PREFIX = "pdf_text:"
+
+
+class PdfExtractionError(Exception):
+    pass
+
+
+def iter_pdf_pages(pdf_stream, max_pages=Config.PDF_MAX_PAGES):
+    reader = PyPDF2.PdfReader(pdf_stream)
+    for page_number, page in enumerate(reader.pages):
+        if page_number >= max_pages:
+            return
+        yield page.extract_text() or ""
+
+def _extract(pdf_bytes, max_pages, max_chars):
+    parts = []
+    length = 0
+    for page_text in iter_pdf_pages(io.BytesIO(pdf_bytes), max_pages):
+        parts.append(page_text[:max_chars - length])
+        length += len(parts[-1])
+        if length >= max_chars:
+            break
+    return "\n".join(parts)
+
+def extract_text_from_pdf(pdf_file, max_pages=Config.PDF_MAX_PAGES, max_chars=Config.PDF_MAX_CHARS):
+    pdf_bytes = pdf_file.read()
+    cache_key = PDF_TEXT_PREFIX + hashlib.sha256(pdf_bytes).hexdigest()
+
+    try:
+        with track_stage("redis"):
+            cached = redis_client.get(cache_key)
+        if cached is not None:
+            return cached
+    except redis.RedisError as e:
+        logger.error(f"PDF text cache lookup failed: {e}")
+
+    try:
+        with track_stage("pdf_extraction"):
+            text = run_blocking(_extract, pdf_bytes, max_pages, max_chars)
+    except Exception as e:
+        raise PdfExtractionError(f"Error in PDF extraction: {str(e)}") from e
+
+    try:
+        with track_stage("redis"):
+            redis_client.set(cache_key, text, ex=Config.PDF_TEXT_CACHE_TTL_SECONDS)
+    except redis.RedisError as e:
+        logger.error(f"PDF text cache store failed: {e}")
+    return text
@@ -7,10 +7,34 @@ load_dotenv()
 REDIS_HOST = os.getenv("REDIS_HOST") 
 REDIS_PORT = os.getenv("REDIS_PORT")
 # REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
 
-redis_client = redis.StrictRedis(
+# Callers wait for a free connection instead of opening one per greenlet/thread.
+redis_pool = redis.BlockingConnectionPool(
     host=REDIS_HOST,
     port=REDIS_PORT,
     # password=REDIS_PASSWORD,
-    decode_responses=True  
-)
\ No newline at end of file
+    decode_responses=True,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=10
+)
+
+redis_client = redis.StrictRedis(connection_pool=redis_pool)
+
+# Raw bytes for values that are not UTF-8 text, e.g. compressed interview sessions.
+redis_binary_pool = redis.BlockingConnectionPool(
+    host=REDIS_HOST,
+    port=REDIS_PORT,
+    decode_responses=False,
+    max_connections=REDIS_MAX_CONNECTIONS,
+    timeout=10
+)
+
+redis_binary_client = redis.StrictRedis(connection_pool=redis_binary_pool)
+
+if os.getenv("REDIS_FAKE", "").lower() in ("1", "true", "yes"):
+    # In-process Redis for local runs and offline benchmarks.
+    import fakeredis # type: ignore
+    fake_server = fakeredis.FakeServer()
+    redis_client = fakeredis.FakeStrictRedis(server=fake_server, decode_responses=True)
+    redis_binary_client = fakeredis.FakeStrictRedis(server=fake_server)
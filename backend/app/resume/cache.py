@@ -0,0 +1,66 @@
+import hashlib
+import json
+import logging
+import re
+import time
+import redis
+from app.config import Config
+from app.redis_client import redis_client
+from app.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "resume_eval:"
+CACHE_INDEX_KEY = "resume_eval_index"
+CACHE_STATS_KEY = "resume_eval_stats"
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+def evaluation_cache_key(resume_text, job_description, mode):
+    digest = hashlib.sha256()
+    digest.update(mode.encode('utf-8'))
+    digest.update(b"\0")
+    digest.update(_normalize(resume_text).encode('utf-8'))
+    digest.update(b"\0")
+    digest.update(_normalize(job_description).encode('utf-8'))
+    return CACHE_PREFIX + digest.hexdigest()
+
+@timed("redis")
+def get_cached_evaluation(cache_key):
+    try:
+        cached = redis_client.get(cache_key)
+        redis_client.hincrby(CACHE_STATS_KEY, "hits" if cached is not None else "misses", 1)
+    except redis.RedisError as e:
+        logger.error(f"Resume cache lookup failed: {e}")
+        return None
+    return json.loads(cached) if cached is not None else None
+
+@timed("redis")
+def store_evaluation(cache_key, evaluation):
+    try:
+        pipe = redis_client.pipeline()
+        pipe.set(cache_key, json.dumps(evaluation), ex=Config.RESUME_CACHE_TTL_SECONDS)
+        pipe.zadd(CACHE_INDEX_KEY, {cache_key: time.time()})
+        pipe.zremrangebyscore(CACHE_INDEX_KEY, 0, time.time() - Config.RESUME_CACHE_TTL_SECONDS)
+        pipe.zcard(CACHE_INDEX_KEY)
+        size = pipe.execute()[-1]
+
+        overflow = size - Config.RESUME_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            evicted = redis_client.zpopmin(CACHE_INDEX_KEY, overflow)
+            if evicted:
+                redis_client.delete(*[key for key, _ in evicted])
+                redis_client.hincrby(CACHE_STATS_KEY, "evictions", len(evicted))
+    except redis.RedisError as e:
+        logger.error(f"Resume cache store failed: {e}")
+
+def cache_stats():
+    stats = {key: int(value) for key, value in (redis_client.hgetall(CACHE_STATS_KEY) or {}).items()}
+    stats.setdefault("hits", 0)
+    stats.setdefault("misses", 0)
+    stats["entries"] = redis_client.zcard(CACHE_INDEX_KEY)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0
+    return stats
@@ -0,0 +1,118 @@
+import re
+
+BULLET_POINTS = ('-', '*', '•')
+CONTACT_KEYWORDS = ('email', 'phone', 'contact', '@')
+SECTION_HEADERS = {
+    'experience': ('experience', 'work experience', 'employment', 'professional experience', 'internships', 'internship'),
+    'education': ('education', 'academics', 'academic background'),
+    'skills': ('skills', 'technical skills', 'key skills', 'core competencies'),
+    'projects': ('projects', 'personal projects', 'academic projects'),
+    'summary': ('summary', 'profile', 'objective', 'about me'),
+    'certifications': ('certifications', 'certificates', 'achievements', 'awards'),
+}
+REQUIRED_SECTIONS = ('skills', 'projects', 'education')
+
+_HEADER_LOOKUP = {alias: section for section, aliases in SECTION_HEADERS.items() for alias in aliases}
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE = re.compile(r"\+?\d[\d\s().-]{8,}\d")
+_METRIC = re.compile(r"\d+(\.\d+)?\s*(%|x\b|k\b|\+)|\$\s?\d")
+_REPEATED_WORD = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
+_LOWERCASE_I = re.compile(r"(^|\s)i(\s|')")
+_MISSING_SPACE = re.compile(r"[a-z][,;][A-Za-z]")
+_DOUBLE_SPACE = re.compile(r"\S {2,}\S")
+_SENTENCE_START = re.compile(r"[.!?]\s+[a-z]")
+
+
+def section_header(line):
+    """The section a heading line opens, e.g. "Work Experience:" -> "experience", else None."""
+    return _HEADER_LOOKUP.get(line.strip().lower().rstrip(':').strip())
+
+def analyze_resume(resume_text):
+    """Collects every layout and rule-based grammar signal in one pass over the lines."""
+    stats = {
+        "bullet_count": 0,
+        "blank_line_count": 0,
+        "has_contact": False,
+        "has_email": False,
+        "has_phone": False,
+        "sections": set(),
+        "metric_lines": 0,
+        "grammar_errors": 0,
+        "word_count": 0,
+    }
+    previous_blank = True
+
+    for line in resume_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if not previous_blank:
+                stats["blank_line_count"] += 1
+            previous_blank = True
+            continue
+        previous_blank = False
+
+        lowered = stripped.lower()
+        stats["word_count"] += len(stripped.split())
+
+        if stripped.startswith(BULLET_POINTS):
+            stats["bullet_count"] += 1
+        if not stats["has_contact"] and any(keyword in lowered for keyword in CONTACT_KEYWORDS):
+            stats["has_contact"] = True
+        if not stats["has_email"] and _EMAIL.search(stripped):
+            stats["has_email"] = True
+        if not stats["has_phone"] and _PHONE.search(stripped):
+            stats["has_phone"] = True
+
+        header = section_header(stripped)
+        if header is not None:
+            stats["sections"].add(header)
+            continue
+
+        if _METRIC.search(stripped):
+            stats["metric_lines"] += 1
+
+        stats["grammar_errors"] += (
+            len(_REPEATED_WORD.findall(stripped))
+            + len(_LOWERCASE_I.findall(stripped))
+            + len(_MISSING_SPACE.findall(stripped))
+            + len(_DOUBLE_SPACE.findall(stripped))
+            + len(_SENTENCE_START.findall(stripped))
+            + abs(stripped.count('(') - stripped.count(')'))
+        )
+
+    return stats
+
+def layout_score_from_stats(stats):
+    layout_score = 0
+    if stats["bullet_count"] > 5:
+        layout_score += 7
+    if stats["blank_line_count"] >= 4:
+        layout_score += 7
+    if stats["has_contact"]:
+        layout_score += 6
+    return layout_score
+
+def local_suggestions(stats):
+    suggestions = []
+    if stats["bullet_count"] <= 5:
+        suggestions.append("Use bullet points to list achievements and responsibilities for better readability.")
+    if stats["blank_line_count"] < 4:
+        suggestions.append("Separate sections with blank lines so each one is easy to scan.")
+    if not stats["has_email"] or not stats["has_phone"]:
+        suggestions.append("Include your contact details, such as a phone number and an email address.")
+    for section in REQUIRED_SECTIONS:
+        if section not in stats["sections"]:
+            suggestions.append(f"Add a \"{section.capitalize()}\" section with a clear heading.")
+    if stats["metric_lines"] < 2:
+        suggestions.append("Add measurable metrics to your contributions, for example percentages or team sizes.")
+    if stats["grammar_errors"] > 0:
+        suggestions.append(f"Proofread the resume; {stats['grammar_errors']} likely grammar or spacing issues were found.")
+    return suggestions or ["No suggestions available."]
+
+def local_review(resume_text):
+    stats = analyze_resume(resume_text)
+    return {
+        "stats": stats,
+        "layout_score": layout_score_from_stats(stats),
+        "suggestions": local_suggestions(stats),
+    }
@@ -0,0 +1,161 @@
+import json
+import logging
+import threading
+import time
+import uuid
+import redis
+from app.config import Config
+from app.redis_client import redis_client
+from .cache import evaluation_cache_key, get_cached_evaluation, store_evaluation
+from .utils import evaluate_resume
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "resume_jobs:queue"
+PROCESSING_KEY = "resume_jobs:processing"
+STATS_KEY = "resume_jobs:stats"
+JOB_PREFIX = "resume_job:"
+
+
+def _job_key(job_id):
+    return f"{JOB_PREFIX}{job_id}"
+
+def _update_job(job_id, pipe=None, **fields):
+    fields["updated_at"] = time.time()
+    target = pipe or redis_client
+    target.hset(_job_key(job_id), mapping=fields)
+    target.expire(_job_key(job_id), Config.RESUME_JOB_TTL_SECONDS)
+
+def submit_job(resume_text, job_description, mode, bypass_cache=False):
+    job_id = uuid.uuid4().hex
+    payload = {
+        "resume_text": resume_text,
+        "job_description": job_description,
+        "mode": mode,
+        "bypass_cache": bypass_cache,
+    }
+
+    pipe = redis_client.pipeline(transaction=True)
+    _update_job(job_id, pipe, status="queued", progress=0, attempts=0, created_at=time.time(), payload=json.dumps(payload))
+    pipe.lpush(QUEUE_KEY, job_id)
+    pipe.hincrby(STATS_KEY, "submitted", 1)
+    pipe.execute()
+    return job_id
+
+def get_job(job_id):
+    job = redis_client.hgetall(_job_key(job_id))
+    if not job:
+        return None
+
+    job.pop("payload", None)
+    for field in ("progress", "attempts"):
+        job[field] = int(job[field])
+    for field in ("created_at", "updated_at"):
+        job[field] = float(job[field])
+    if "result" in job:
+        job["result"] = json.loads(job["result"])
+    job["job_id"] = job_id
+    return job
+
+def process_next(timeout=5):
+    job_id = redis_client.brpoplpush(QUEUE_KEY, PROCESSING_KEY, timeout)
+    if job_id is None:
+        return False
+
+    payload = redis_client.hget(_job_key(job_id), "payload")
+    if payload is None:
+        # The job expired while it was waiting.
+        redis_client.lrem(PROCESSING_KEY, 1, job_id)
+        return True
+    payload = json.loads(payload)
+    attempts = redis_client.hincrby(_job_key(job_id), "attempts", 1)
+    _update_job(job_id, status="running", progress=10)
+
+    try:
+        cache_key = evaluation_cache_key(payload["resume_text"], payload["job_description"], payload["mode"])
+        result = None if payload["bypass_cache"] else get_cached_evaluation(cache_key)
+        if result is None:
+            _update_job(job_id, progress=30)
+            result = evaluate_resume(payload["resume_text"], payload["job_description"], payload["mode"])
+            if not result["partial"]:
+                store_evaluation(cache_key, result)
+    except Exception as e:
+        logger.error(f"Resume job {job_id} failed on attempt {attempts}: {e}")
+        _retry_or_fail(job_id, attempts, str(e))
+        return True
+
+    if result["partial"] and attempts < Config.RESUME_JOB_MAX_ATTEMPTS:
+        # Stage errors are caught by run_stages, so a timed out stage shows up
+        # here rather than as an exception; retry before settling for it.
+        failed = sorted(name for name, status in result["stage_status"].items() if status != "ok")
+        logger.warning(f"Resume job {job_id} was partial on attempt {attempts}: {failed}")
+        _retry_or_fail(job_id, attempts, f"Stages did not complete: {', '.join(failed)}")
+        return True
+
+    pipe = redis_client.pipeline(transaction=True)
+    _update_job(job_id, pipe, status="done", progress=100, result=json.dumps(result))
+    pipe.hdel(_job_key(job_id), "payload", "error")
+    pipe.lrem(PROCESSING_KEY, 1, job_id)
+    pipe.hincrby(STATS_KEY, "completed", 1)
+    pipe.execute()
+    return True
+
+def _retry_or_fail(job_id, attempts, error):
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lrem(PROCESSING_KEY, 1, job_id)
+    if attempts < Config.RESUME_JOB_MAX_ATTEMPTS:
+        _update_job(job_id, pipe, status="queued", progress=0, error=error)
+        pipe.lpush(QUEUE_KEY, job_id)
+        pipe.hincrby(STATS_KEY, "retried", 1)
+    else:
+        _update_job(job_id, pipe, status="failed", progress=100, error=error)
+        pipe.hdel(_job_key(job_id), "payload")
+        pipe.hincrby(STATS_KEY, "failed", 1)
+    pipe.execute()
+
+def requeue_stale_jobs(visibility_seconds=Config.RESUME_JOB_VISIBILITY_SECONDS):
+    # Jobs left in the processing list by a crashed worker go back to the queue.
+    requeued = 0
+    for job_id in redis_client.lrange(PROCESSING_KEY, 0, -1):
+        status, updated_at = redis_client.hmget(_job_key(job_id), "status", "updated_at")
+        if status is None:
+            redis_client.lrem(PROCESSING_KEY, 1, job_id)
+        elif status == "running" and time.time() - float(updated_at) > visibility_seconds:
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.lrem(PROCESSING_KEY, 1, job_id)
+            _update_job(job_id, pipe, status="queued", progress=0)
+            pipe.lpush(QUEUE_KEY, job_id)
+            pipe.hincrby(STATS_KEY, "requeued", 1)
+            pipe.execute()
+            requeued += 1
+    return requeued
+
+def queue_metrics():
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.llen(QUEUE_KEY)
+    pipe.llen(PROCESSING_KEY)
+    pipe.hgetall(STATS_KEY)
+    queue_depth, processing, stats = pipe.execute()
+
+    metrics = {key: int(value) for key, value in stats.items()}
+    for key in ("submitted", "completed", "failed", "retried", "requeued"):
+        metrics.setdefault(key, 0)
+    metrics["queue_depth"] = queue_depth
+    metrics["processing"] = processing
+    return metrics
+
+def run_worker(stop_event=None):
+    while stop_event is None or not stop_event.is_set():
+        try:
+            process_next()
+        except redis.RedisError as e:
+            logger.error(f"Resume worker lost Redis connection: {e}")
+            time.sleep(1)
+
+def start_inline_workers(count):
+    # Worker threads inside the web process, e.g. with REDIS_FAKE where a
+    # separate worker process cannot share the in-memory Redis.
+    stop_event = threading.Event()
+    for i in range(count):
+        threading.Thread(target=run_worker, args=(stop_event,), name=f"resume-job-worker-{i}", daemon=True).start()
+    return stop_event
@@ -0,0 +1,138 @@
+import re
+import numpy as np
+from app.concurrency import run_blocking
+from app.config import Config
+from app.embedding_client import embedding_service
+from app.metrics import track_stage
+from .fast_scoring import BULLET_POINTS, section_header
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+OTHER_SECTION = "other"
+EVIDENCE_CHARS = 200
+
+
+def _sentences(line):
+    line = line.strip().lstrip(''.join(BULLET_POINTS)).strip()
+    return [sentence for sentence in _SENTENCE_END.split(line) if sentence.strip()]
+
+def resume_chunks(resume_text, max_words=Config.RESUME_MATCH_CHUNK_WORDS):
+    """Splits a resume into (section, text) chunks that fit the embedding model's window.
+
+    Sentences are packed together up to max_words and never across a section
+    heading; a single sentence longer than that is cut into word windows.
+    """
+    chunks = []
+    section, words = OTHER_SECTION, []
+
+    def flush():
+        if words:
+            chunks.append((section, ' '.join(words)))
+            words.clear()
+
+    for line in resume_text.splitlines():
+        header = section_header(line)
+        if header is not None:
+            flush()
+            section = header
+            continue
+        for sentence in _sentences(line):
+            sentence_words = sentence.split()
+            if len(words) + len(sentence_words) > max_words:
+                flush()
+            while len(sentence_words) > max_words:
+                chunks.append((section, ' '.join(sentence_words[:max_words])))
+                sentence_words = sentence_words[max_words:]
+            words.extend(sentence_words)
+    flush()
+    return chunks
+
+def requirement_chunks(job_description, max_requirements=Config.RESUME_MATCH_MAX_REQUIREMENTS):
+    """The job description's bullets and sentences, each treated as one requirement."""
+    requirements = []
+    for line in job_description.splitlines():
+        # Lead-ins such as "Requirements:" or "Skills" are headings, not requirements.
+        if section_header(line) is not None:
+            continue
+        for sentence in _sentences(line):
+            # One-word bullets ("- Python") are kept: they are often the key skills.
+            if not sentence.endswith(':') and sentence not in requirements:
+                requirements.append(sentence)
+    if not requirements and job_description.strip():
+        requirements = [job_description.strip()]
+    return requirements[:max_requirements]
+
+def _unit(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def _empty_match(requirements):
+    return {"score": 0.0, "coverage": 0.0, "matched": 0, "requirement_count": len(requirements),
+            "chunk_count": 0, "sections": {}}
+
+def _aggregate(requirements, chunks, similarity, threshold, include_requirements):
+    # Max pooling over chunks gives each requirement its best supporting evidence,
+    # mean pooling over requirements turns that into one score.
+    best = similarity.max(axis=1)
+    best_chunk = similarity.argmax(axis=1)
+    matched = best >= threshold
+
+    sections = {}
+    chunk_sections = np.asarray([section for section, _ in chunks])
+    for section in dict.fromkeys(chunk_sections.tolist()):
+        sections[section] = round(float(similarity[:, chunk_sections == section].max(axis=1).mean()), 4)
+
+    match = {
+        "score": round(float(np.clip(best.mean(), 0, 1)), 4),
+        "coverage": round(float(matched.mean()), 4),
+        "matched": int(matched.sum()),
+        "requirement_count": len(requirements),
+        "chunk_count": len(chunks),
+        "sections": sections,
+    }
+    if include_requirements:
+        match["requirements"] = [
+            {
+                "requirement": requirement,
+                "similarity": round(float(best[i]), 4),
+                "matched": bool(matched[i]),
+                "section": chunks[best_chunk[i]][0],
+                "evidence": chunks[best_chunk[i]][1][:EVIDENCE_CHARS],
+            }
+            for i, requirement in enumerate(requirements)
+        ]
+    return match
+
+def match_resumes(job_description, resume_texts, threshold=Config.RESUME_MATCH_THRESHOLD, include_requirements=True):
+    """Scores every resume against the job description's requirements.
+
+    Requirements go through the embedding cache, since the same job
+    description is scored over and over. The chunks of every resume are
+    encoded in one batched call straight through the model, so they do not
+    evict those vectors, then each resume gets a requirement-by-chunk cosine
+    matrix.
+    """
+    requirements = requirement_chunks(job_description)
+    chunked = [resume_chunks(text) for text in resume_texts]
+    if not requirements:
+        return [_empty_match(requirements) for _ in resume_texts]
+
+    requirement_vectors = _unit(np.asarray(embedding_service.encode(requirements), dtype='float32'))
+    chunk_texts = [text for chunks in chunked for _, text in chunks]
+    if chunk_texts:
+        with track_stage("embedding"):
+            vectors = run_blocking(embedding_service.model.encode, chunk_texts, batch_size=embedding_service.batch_size)
+        vectors = _unit(np.asarray(vectors, dtype='float32'))
+
+    matches = []
+    offset = 0
+    for chunks in chunked:
+        if not chunks:
+            matches.append(_empty_match(requirements))
+            continue
+        chunk_vectors = vectors[offset:offset + len(chunks)]
+        offset += len(chunks)
+        similarity = requirement_vectors @ chunk_vectors.T
+        matches.append(_aggregate(requirements, chunks, similarity, threshold, include_requirements))
+    return matches
+
+def match_resume(job_description, resume_text, threshold=Config.RESUME_MATCH_THRESHOLD):
+    return match_resumes(job_description, [resume_text], threshold)[0]
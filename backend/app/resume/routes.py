@@ -1,25 +1,125 @@
 from flask import Blueprint, request, jsonify # type: ignore
-from .utils import extract_text_from_pdf, evaluate_resume
+from .utils import evaluate_resume, rank_resumes
+from app.pdf_extraction import extract_text_from_pdf, PdfExtractionError
+from .cache import evaluation_cache_key, get_cached_evaluation, store_evaluation, cache_stats
+from .jobs import submit_job, get_job, queue_metrics
 from werkzeug.utils import secure_filename
+from app.config import Config
+from app.auth.utils import require_auth
 
 resume_bp = Blueprint('resume', __name__)
 
 @resume_bp.route('/evaluate_resume', methods=['POST'])
+@require_auth
 def evaluate_resume_route():
     pdf_file = request.files.get('resume')
     job_description = request.form.get('job_description')
+    bypass_cache = request.form.get('refresh', '').lower() in ('1', 'true', 'yes')
+    mode = request.form.get('mode', Config.RESUME_EVAL_MODE)
 
     if not pdf_file or not job_description:
         return jsonify({"error": "Both resume and job description are required"}), 400
     if not pdf_file.filename.endswith('.pdf'):
         return jsonify({"error": "Invalid file format, only PDFs are allowed"}), 400
+    if mode not in Config.RESUME_EVAL_MODES:
+        return jsonify({"error": f"Unknown evaluation mode {mode}"}), 400
 
     try:
         resume_text = extract_text_from_pdf(pdf_file)
-        evaluation_results = evaluate_resume(resume_text, job_description)
+        cache_key = evaluation_cache_key(resume_text, job_description, mode)
 
+        if not bypass_cache:
+            cached = get_cached_evaluation(cache_key)
+            if cached is not None:
+                cached["cached"] = True
+                return jsonify(cached), 200
+
+        evaluation_results = evaluate_resume(resume_text, job_description, mode)
+        if not evaluation_results["partial"]:
+            store_evaluation(cache_key, evaluation_results)
+
+        evaluation_results["cached"] = False
         return jsonify(evaluation_results), 200
 
+    except PdfExtractionError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@resume_bp.route('/evaluate_batch', methods=['POST'])
+@require_auth
+def evaluate_batch_route():
+    pdf_files = request.files.getlist('resumes')
+    job_description = request.form.get('job_description')
+
+    if not pdf_files or not job_description:
+        return jsonify({"error": "Resumes and job description are required"}), 400
+    if len(pdf_files) > Config.RESUME_BATCH_MAX_FILES:
+        return jsonify({"error": f"At most {Config.RESUME_BATCH_MAX_FILES} resumes can be ranked at once"}), 400
+
+    resumes, errors = [], []
+    for pdf_file in pdf_files:
+        if not pdf_file.filename.endswith('.pdf'):
+            errors.append({"filename": pdf_file.filename, "error": "Invalid file format, only PDFs are allowed"})
+            continue
+        try:
+            resumes.append((pdf_file.filename, extract_text_from_pdf(pdf_file)))
+        except PdfExtractionError as e:
+            errors.append({"filename": pdf_file.filename, "error": str(e)})
+
+    if not resumes:
+        return jsonify({"error": "No readable resumes were uploaded", "errors": errors}), 400
+
+    try:
+        results = rank_resumes(job_description, resumes)
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+    return jsonify({"results": results, "errors": errors}), 200
+
+@resume_bp.route('/jobs', methods=['POST'])
+@require_auth
+def submit_job_route():
+    pdf_file = request.files.get('resume')
+    job_description = request.form.get('job_description')
+    bypass_cache = request.form.get('refresh', '').lower() in ('1', 'true', 'yes')
+    mode = request.form.get('mode', Config.RESUME_EVAL_MODE)
+
+    if not pdf_file or not job_description:
+        return jsonify({"error": "Both resume and job description are required"}), 400
+    if not pdf_file.filename.endswith('.pdf'):
+        return jsonify({"error": "Invalid file format, only PDFs are allowed"}), 400
+    if mode not in Config.RESUME_EVAL_MODES:
+        return jsonify({"error": f"Unknown evaluation mode {mode}"}), 400
+
+    try:
+        resume_text = extract_text_from_pdf(pdf_file)
+        job_id = submit_job(resume_text, job_description, mode, bypass_cache)
+    except PdfExtractionError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+    return jsonify({"job_id": job_id, "status": "queued", "status_url": f"{request.script_root}/resume/jobs/{job_id}"}), 202
+
+@resume_bp.route('/jobs/metrics', methods=['GET'])
+def job_metrics_route():
+    try:
+        return jsonify(queue_metrics()), 200
+    except Exception as e:
+        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+@resume_bp.route('/jobs/<job_id>', methods=['GET'])
+@require_auth
+def job_status_route(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+    return jsonify(job), 200
+
+@resume_bp.route('/cache_stats', methods=['GET'])
+def cache_stats_route():
+    try:
+        return jsonify(cache_stats()), 200
     except Exception as e:
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
-    
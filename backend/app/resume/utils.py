@@ -1,77 +1,50 @@
-import PyPDF2
-import google.generativeai as genai
-import os
+import json
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from flask import jsonify
-from sentence_transformers import SentenceTransformer # type: ignore
-from sklearn.metrics.pairwise import cosine_similarity
-from dotenv import load_dotenv
+from app.config import Config
+from app.llm_gateway import llm_gateway
+from app.metrics import run_in_context
+from .fast_scoring import analyze_resume, layout_score_from_stats, local_review
+from .matching import match_resume, match_resumes
 
-def extract_text_from_pdf(pdf_file):
-    try:
-        reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        for page in reader.pages:
-            text += page.extract_text()
-        
-        return text
+logger = logging.getLogger(__name__)
+
+resume_executor = ThreadPoolExecutor(max_workers=Config.RESUME_EVAL_WORKERS, thread_name_prefix="resume-eval")
 
-    except Exception as e:
-        return f"Error in PDF extraction: {str(e)}"
-    
 def grammar_check(text):
-    load_dotenv()
-    GEMINI_KEY = os.getenv('GEMINI_KEY')
-    genai.configure(api_key=GEMINI_KEY)
-    gemini_model = genai.GenerativeModel("gemini-1.5-flash")
     prompt = f'''
     This is the text of the resume's text: {text}
     Can you give me the grammatical error count in numbers?
     Just the number of errors.
     '''
-    response = gemini_model.generate_content(prompt)
-    errors = int(response.text)
+    response = llm_gateway.generate(prompt, "resume.grammar_check")
+    errors = parse_error_count(response)
+    if errors is None:
+        raise ValueError(f"Could not read an error count from {response[:80]!r}")
+    return grammar_score_from_errors(errors, text)
+
+def parse_error_count(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return max(0, int(value))
+    match = re.search(r"\d+", str(value))
+    return int(match.group()) if match else None
+
+def grammar_score_from_errors(errors, text):
     total_words = len(text.split())
     error_ratio = errors / total_words if total_words > 0 else 0 
     grammar_score = max(0, 30 * (1 - error_ratio))  
     return grammar_score
 
 def layout_check(resume_text):
-    layout_score = 0
-
-    bullet_points = ['-', '*', '•']
-    bullet_count = sum(1 for line in resume_text.splitlines() if line.strip().startswith(tuple(bullet_points)))
-    if bullet_count > 5: 
-        layout_score += 7 
-
-    lines = resume_text.splitlines()
-    blank_line_count = sum(1 for i in range(1, len(lines)) if lines[i].strip() == "" and lines[i - 1].strip() != "")
-    if blank_line_count >= 4:  
-        layout_score += 7  
-
-    contact_keywords = ['email', 'phone', 'contact', '@']
-    if any(keyword in resume_text.lower() for keyword in contact_keywords):
-        layout_score += 6  
-
-    return layout_score
+    return layout_score_from_stats(analyze_resume(resume_text))
 
-def keyword_similarity(job_desc,resume_text):
-    model = SentenceTransformer('paraphrase-MiniLM-L6-v2')
-
-    job_vec = model.encode([job_desc])
-    resume_vec = model.encode([resume_text])
-
-    similarity_score = cosine_similarity(job_vec, resume_vec)[0][0]
-
-    return similarity_score
-
-def improvement_suggestions_gemini(job_desc, resume_text):
-    load_dotenv()
-
-    GEMINI_KEY = os.getenv('GEMINI_KEY')
-    genai.configure(api_key=GEMINI_KEY)
-    gemini_model = genai.GenerativeModel("gemini-1.5-flash")
-    prompt = f'''Please review the following resume text ({resume_text}) in reference to the job description ({job_desc}). The review
+def suggestions_prompt(job_desc, resume_text):
+    return f'''Please review the following resume text ({resume_text}) in reference to the job description ({job_desc}). The review
 should follow an interview-like feedback style, with everything based on the given resume text. Focus on the following key areas:
 
 Bullet Points Usage:
@@ -150,34 +123,195 @@ Conclusion: Finally, based on the review of the provided resume text and job des
 the resume and ensure it aligns well with the job description. Always base your suggestions and examples on the provided resume text,
  and provide clear and actionable feedback.'''
 
-    try:
-        response = gemini_model.generate_content(prompt)
-        
-        suggestions = response.text.strip() if hasattr(response, 'text') else "No suggestions available."
+def improvement_suggestions_gemini(job_desc, resume_text):
+    prompt = suggestions_prompt(job_desc, resume_text)
 
-        suggestions_list = suggestions.split('. ')
-        suggestions_list = [sentence.strip() + '.' for sentence in suggestions_list if sentence] 
+    try:
+        response = llm_gateway.generate(prompt, "resume.suggestions")
         
-        return suggestions_list
+        return split_suggestions(response)
     except Exception as e:
-        print(f"Error occurred while fetching suggestions: {e}")
+        logger.error(f"Error occurred while fetching suggestions: {e}")
         return ["No suggestions available."]
+
+def split_suggestions(text):
+    suggestions = text.strip() or "No suggestions available."
+
+    suggestions_list = suggestions.split('. ')
+    suggestions_list = [sentence.strip().rstrip('.') + '.' for sentence in suggestions_list if sentence.strip()] 
     
-def evaluate_resume(resume_text, job_description):
-    keyword_score = keyword_similarity(job_description,resume_text)
-    grammar_score = grammar_check(resume_text)
-    layout_score = layout_check(resume_text)
+    return suggestions_list
+
+STRUCTURED_REVIEW_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "grammar_error_count": {"type": "integer"},
+        "suggestions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["grammar_error_count", "suggestions"],
+}
+
+def parse_structured_review(text):
+    text = re.sub(r"^```(?:json)?\s*|\s*```$", "", text.strip())
+    try:
+        review = json.loads(text)
+    except ValueError:
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        try:
+            review = json.loads(match.group()) if match else None
+        except ValueError:
+            review = None
+    if not isinstance(review, dict):
+        return None, None
+
+    errors = parse_error_count(review.get("grammar_error_count"))
+    suggestions = review.get("suggestions")
+    if isinstance(suggestions, str):
+        suggestions = split_suggestions(suggestions)
+    elif isinstance(suggestions, list):
+        suggestions = [str(suggestion).strip() for suggestion in suggestions if str(suggestion).strip()] or None
+    else:
+        suggestions = None
+    return errors, suggestions
+
+def structured_review(job_desc, resume_text):
+    prompt = suggestions_prompt(job_desc, resume_text) + '''
+
+Also count the grammatical errors in the resume text.
+Respond only with a JSON object with two keys: "grammar_error_count", the number of grammatical errors as an integer,
+and "suggestions", a list of the feedback sentences.'''
+
+    response = llm_gateway.generate(prompt, "resume.structured_review", generation_config={
+        "response_mime_type": "application/json",
+        "response_schema": STRUCTURED_REVIEW_SCHEMA,
+    })
+    errors, suggestions = parse_structured_review(response)
+
+    # Fall back to the dedicated calls for anything the reply did not contain.
+    grammar_score = grammar_score_from_errors(errors, resume_text) if errors is not None else grammar_check(resume_text)
+    if suggestions is None:
+        suggestions = improvement_suggestions_gemini(job_desc, resume_text)
+    return {"grammar_score": grammar_score, "suggestions": suggestions}
+
+def run_stages(stages, timeouts):
+    started = time.monotonic()
+    futures = {name: run_in_context(resume_executor, func, *args) for name, (func, args) in stages.items()}
+    results, status = {}, {}
+
+    # Every stage's timeout counts from submission, so the slowest stage bounds the total.
+    for name, future in futures.items():
+        timeout = max(0, started + timeouts.get(name, 0) - time.monotonic())
+        try:
+            results[name] = future.result(timeout=timeout)
+            status[name] = "ok"
+        except FuturesTimeoutError:
+            future.cancel()
+            results[name] = None
+            status[name] = "timeout"
+        except Exception as e:
+            logger.error(f"Resume evaluation stage {name} failed: {e}")
+            results[name] = None
+            status[name] = "error"
+
+    return results, status
+
+def run_stages_inline(stages):
+    # For cheap in-process stages: queuing them on resume_executor behind LLM
+    # calls would cost far more than running them in the caller.
+    results, status = {}, {}
+    for name, (func, args) in stages.items():
+        try:
+            results[name] = func(*args)
+            status[name] = "ok"
+        except Exception as e:
+            logger.error(f"Resume evaluation stage {name} failed: {e}")
+            results[name] = None
+            status[name] = "error"
+    return results, status
+
+def evaluate_resume(resume_text, job_description, mode=Config.RESUME_EVAL_MODE):
+    stages = {
+        "keyword_score": (match_resume, (job_description, resume_text)),
+        "layout_score": (layout_check, (resume_text,)),
+    }
+    if mode == "fast":
+        stages = {
+            "keyword_score": (match_resume, (job_description, resume_text)),
+            "local_review": (local_review, (resume_text,)),
+        }
+    elif mode == "structured":
+        stages["review"] = (structured_review, (job_description, resume_text))
+    else:
+        stages["grammar_score"] = (grammar_check, (resume_text,))
+        stages["suggestions"] = (improvement_suggestions_gemini, (job_description, resume_text))
+
+    if mode == "fast":
+        results, stage_status = run_stages_inline(stages)
+    else:
+        results, stage_status = run_stages(stages, Config.RESUME_STAGE_TIMEOUTS)
+    if mode == "structured":
+        review = results.pop("review") or {}
+        results["grammar_score"] = review.get("grammar_score")
+        results["suggestions"] = review.get("suggestions")
+    elif mode == "fast":
+        review = results.pop("local_review")
+        if review is not None:
+            results["grammar_score"] = grammar_score_from_errors(review["stats"]["grammar_errors"], resume_text)
+            results["layout_score"] = review["layout_score"]
+            results["suggestions"] = review["suggestions"]
+        else:
+            results["grammar_score"] = results["layout_score"] = results["suggestions"] = None
+
+    keyword_match = results["keyword_score"] or {}
+    keyword_score = keyword_match.get("score", 0)
+    grammar_score = results["grammar_score"] or 0
+    layout_score = results["layout_score"] or 0
+    suggestions = results["suggestions"] if results["suggestions"] is not None else ["No suggestions available."]
     total_ats_score = str((keyword_score * 50) + grammar_score + layout_score)
-    suggestions = improvement_suggestions_gemini(job_description, resume_text)
-    
+
     response = {
         "ats_score" : total_ats_score,
         "ats_score_breakdown" : {
             "keyword_score" : str(keyword_score),
+            "keyword_score_details" : keyword_match,
             "grammar_score" : grammar_score,
             "layout_score" : layout_score
         },
         "suggestions" : suggestions,
-
+        "stage_status" : stage_status,
+        "mode" : mode,
+        "partial" : any(value != "ok" for value in stage_status.values()),
     }
-    return response
\ No newline at end of file
+    return response
+
+def rank_resumes(job_description, resumes):
+    filenames = [filename for filename, _ in resumes]
+    texts = [text for _, text in resumes]
+    # Per-requirement evidence is left out to keep large batch responses small.
+    keyword_matches = match_resumes(job_description, texts, include_requirements=False)
+
+    ranked = []
+    for filename, resume_text, keyword_match in zip(filenames, texts, keyword_matches):
+        keyword_score = keyword_match["score"]
+        review = local_review(resume_text)
+        grammar_score = grammar_score_from_errors(review["stats"]["grammar_errors"], resume_text)
+        layout_score = review["layout_score"]
+        total_ats_score = (keyword_score * 50) + grammar_score + layout_score
+        ranked.append({
+            "filename": filename,
+            "ats_score": str(total_ats_score),
+            "ats_score_breakdown": {
+                "keyword_score": str(keyword_score),
+                "keyword_score_details": keyword_match,
+                "grammar_score": grammar_score,
+                "layout_score": layout_score
+            },
+            "suggestions": review["suggestions"],
+            "_total": total_ats_score,
+        })
+
+    ranked.sort(key=lambda result: result["_total"], reverse=True)
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+        del result["_total"]
+    return ranked
@@ -1,13 +1,45 @@
-from supabase import create_client # type: ignore
-from dotenv import load_dotenv # type: ignore
 import os
+import threading
+from dotenv import load_dotenv # type: ignore
+
+
+class LazySupabaseClient:
+    """Builds the Supabase client on first use.
+
+    Importing the app then needs neither the supabase package loaded nor the
+    credentials set; a missing SUPABASE_URL/SUPABASE_KEY only fails the
+    first call that actually talks to Supabase.
+    """
+
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from supabase import create_client # type: ignore
+                    load_dotenv()
+                    url = os.getenv("SUPABASE_URL")
+                    key = os.getenv("SUPABASE_KEY")
+                    if not url or not key:
+                        raise ValueError("Supabase credentials are not set in environment variables.")
+                    self._client = create_client(url, key)
+        return self._client
+
+    @property
+    def loaded(self):
+        return self._client is not None
 
-load_dotenv()
+    def reset(self):
+        # A forked worker must not reuse the parent's HTTP connections.
+        with self._lock:
+            self._client = None
 
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+    def __getattr__(self, name):
+        return getattr(self.client, name)
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Supabase credentials are not set in environment variables.")
 
-supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
\ No newline at end of file
+supabase_client = LazySupabaseClient()
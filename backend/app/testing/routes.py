@@ -1,6 +1,10 @@
+import logging
 from app.supabase_client import supabase_client
 from flask import Blueprint, jsonify
 from app.redis_client import redis_client
+from app.llm_gateway import llm_gateway
+
+logger = logging.getLogger(__name__)
 
 test_bp = Blueprint('testing',__name__)
 
@@ -19,10 +23,10 @@ def redis_test():
         test_key = "test_key"
         test_value = "Hello, Redis!"
         redis_client.set(test_key, test_value)
-        print(f"Set key '{test_key}' with value '{test_value}'")
+        logger.info(f"Set key '{test_key}' with value '{test_value}'")
 
         retrieved_value = redis_client.get(test_key)
-        print(f"Retrieved value for key '{test_key}': {retrieved_value}")
+        logger.info(f"Retrieved value for key '{test_key}': {retrieved_value}")
 
         return jsonify({
             "status": "success",
@@ -31,5 +35,10 @@ def redis_test():
             "retrieved_value": retrieved_value
         }), 200
     except Exception as e:
-        print(f"Error during Redis test: {e}")
-        return jsonify({"status": "error", "message": str(e)}), 500
\ No newline at end of file
+        logger.error(f"Error during Redis test: {e}")
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+
+@test_bp.route('/llm',methods=['GET'])
+def llm_stats():
+    return jsonify(llm_gateway.stats()), 200
@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+from flask import jsonify # type: ignore
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+PENDING, WARMING, READY, FAILED, SKIPPED = "pending", "warming", "ready", "failed", "skipped"
+
+
+class WarmupRegistry:
+    """Named warm-up steps that preload models, clients and indexes.
+
+    Each step runs in its own background thread when start() is called, so
+    the process can bind its port straight away. A failed step is retried
+    with exponential backoff, since the subsystem behind it (Supabase, the
+    first RAG build) often recovers on its own. /ready reports the state of
+    every step and only answers 200 once the required ones are warm.
+    preload() instead runs the steps that have a preload function
+    synchronously, for a master process about to fork its workers.
+    """
+
+    def __init__(self, retry_seconds=Config.WARMUP_RETRY_SECONDS, max_retry_seconds=Config.WARMUP_MAX_RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._steps = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, func, required=True, preload=None):
+        with self._lock:
+            self._steps[name] = {"func": func, "preload": preload, "required": required,
+                                 "state": PENDING, "seconds": None, "error": None}
+
+    def preload(self):
+        with self._lock:
+            names = [name for name, step in self._steps.items() if step["preload"] and step["state"] == PENDING]
+        for name in names:
+            self.run(name, preload=True)
+
+    def start(self, enabled=True):
+        with self._lock:
+            # Steps that failed during a pre-fork preload get another try in each worker.
+            names = [name for name, step in self._steps.items() if step["state"] in (PENDING, FAILED)]
+            if not enabled:
+                for name in names:
+                    self._steps[name]["state"] = SKIPPED
+                return
+        for name in names:
+            threading.Thread(target=self._run_until_ready, args=(name,), name=f"warmup-{name}", daemon=True).start()
+
+    def _run_until_ready(self, name):
+        delay = self.retry_seconds
+        while not self.run(name) and delay > 0:
+            logger.info(f"Retrying warm-up step {name} in {delay}s")
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_retry_seconds)
+
+    def run(self, name, preload=False):
+        with self._lock:
+            step = self._steps[name]
+            step["state"], step["error"] = WARMING, None
+        started = time.perf_counter()
+        try:
+            (step["preload"] if preload else step["func"])()
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {e}")
+            state, error = FAILED, str(e)
+        else:
+            state, error = READY, None
+        with self._lock:
+            step["state"], step["error"] = state, error
+            step["seconds"] = round(time.perf_counter() - started, 3)
+        if state == READY:
+            logger.info(f"Warm-up step {name} finished in {step['seconds']}s")
+        return state == READY
+
+    def status(self):
+        with self._lock:
+            subsystems = {
+                name: {key: step[key] for key in ("state", "required", "seconds", "error")}
+                for name, step in self._steps.items()
+            }
+        ready = all(step["state"] in (READY, SKIPPED) for step in subsystems.values() if step["required"])
+        return {"ready": ready, "subsystems": subsystems}
+
+
+warmup = WarmupRegistry()
+
+
+def init_app(app):
+    @app.route('/ready', methods=['GET'])
+    def ready():
+        status = warmup.status()
+        return jsonify(status), 200 if status["ready"] else 503
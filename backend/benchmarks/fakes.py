@@ -0,0 +1,244 @@
+import hashlib
+import io
+import json
+import threading
+import time
+import numpy as np
+
+EMBEDDING_DIM = 64
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, table, latency):
+        self._table = table
+        self._latency = latency
+        self._columns = None
+        self._filters = []
+        self._insert = None
+
+    def select(self, columns):
+        if columns.strip() != "*":
+            self._columns = [column.strip() for column in columns.split(",")]
+        return self
+
+    def eq(self, column, value):
+        self._filters.append((column, value))
+        return self
+
+    def insert(self, row):
+        self._insert = row
+        return self
+
+    def execute(self):
+        time.sleep(self._latency)
+        rows = self._table.rows
+        if self._insert is not None:
+            with self._table.lock:
+                row = dict(self._insert, id=len(rows) + 1)
+                rows.append(row)
+            return FakeResult([row])
+
+        matched = [row for row in rows if all(row.get(column) == value for column, value in self._filters)]
+        if self._columns is not None:
+            matched = [{column: row.get(column) for column in self._columns} for row in matched]
+        return FakeResult(matched)
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.lock = threading.Lock()
+
+
+class FakeBucket:
+    def __init__(self, files, latency):
+        self._files = files
+        self._latency = latency
+
+    def download(self, name):
+        time.sleep(self._latency)
+        return self._files[name]
+
+    def list(self):
+        time.sleep(self._latency)
+        return [{"name": name, "metadata": {"eTag": hashlib.md5(data).hexdigest()}} for name, data in self._files.items()]
+
+
+class FakeStorage:
+    def __init__(self, buckets, latency):
+        self._buckets = buckets
+        self._latency = latency
+
+    def from_(self, bucket):
+        return FakeBucket(self._buckets[bucket], self._latency)
+
+
+class FakeSupabase:
+    """In-memory stand-in for the parts of the Supabase client the app uses."""
+
+    def __init__(self, tables, buckets, latency=0.0):
+        self._tables = {name: FakeTable(rows) for name, rows in tables.items()}
+        self._latency = latency
+        self.storage = FakeStorage(buckets, latency)
+
+    @property
+    def client(self):
+        return self
+
+    def table(self, name):
+        return FakeQuery(self._tables.setdefault(name, FakeTable([])), self._latency)
+
+
+class FakeLeetCodeResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class FakeLeetCode:
+    """Answers the question(titleSlug) GraphQL query with a generated problem."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def post(self, url, json=None, timeout=None):
+        time.sleep(self.latency)
+        slug = json["query"].split('titleSlug: "')[1].split('"')[0]
+        return FakeLeetCodeResponse({"data": {"question": {
+            "title": slug.replace("-", " ").title(),
+            "difficulty": "Medium",
+            "content": f"<p>Solve {slug} efficiently.</p>" * 20,
+            "exampleTestcases": "[1,2,3]\n4",
+        }}})
+
+
+def _hash_vector(text):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+    vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM).astype("float32")
+    return vector / np.linalg.norm(vector)
+
+
+class FakeEmbeddings:
+    """Deterministic replacement for the remote Google RAG embeddings."""
+
+    name = "google"
+    model_name = "fake"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def warm_up(self):
+        pass
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        return np.vstack([_hash_vector(text) for text in texts])
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return _hash_vector(text)
+
+
+class FakeSentenceModel:
+    """Deterministic replacement for a SentenceTransformer model."""
+
+    def __init__(self, latency_per_text=0.0):
+        self.latency_per_text = latency_per_text
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        time.sleep(self.latency_per_text * len(texts))
+        return np.vstack([_hash_vector(text) for text in texts])
+
+
+def fake_llm_responder(prompt):
+    if "grammar_error_count" in prompt:
+        return json.dumps({
+            "grammar_error_count": 2,
+            "suggestions": ["Use bullet points for achievements.", "Add metrics to your project outcomes."],
+        })
+    if "grammatical error count" in prompt:
+        return "2"
+    if "keeping notes for an ongoing technical interview" in prompt:
+        return "The candidate introduced themselves and discussed a web project and its caching layer."
+    if "improvement suggestions" in prompt:
+        return "- Give more concrete examples.\n- Quantify the impact of your projects."
+    return "Thanks for sharing. How would you reduce the latency of the service you described?"
+
+
+def default_tables(problem_count=50):
+    domains = [{"id": 1, "name": "SDE"}, {"id": 2, "name": "DS"}]
+    rounds = [{"id": 1, "name": "HR"}, {"id": 2, "name": "TECHNICAL_1"}, {"id": 3, "name": "TECHNICAL"}]
+    rules = [
+        {"domain_id": domain["id"], "round_id": round_["id"], "rule_content": f"Rules for {domain['name']} {round_['name']} round. " * 10}
+        for domain in domains for round_ in rounds
+    ]
+    problems = [{"id": i, "name": f"benchmark-problem-{i}"} for i in range(1, problem_count + 1)]
+    return {"domains": domains, "rounds": rounds, "interview_rules": rules, "problems": problems, "auth": []}
+
+
+def default_buckets(rows=200):
+    lines = ["Answer,Follow-Up Question"]
+    for i in range(rows):
+        lines.append(f"\"I used approach {i} with a cache and a queue\",\"How would approach {i} behave under load?\"")
+    return {"ragfiles": {"answers_followup_questions.csv": "\n".join(lines).encode("utf-8")}}
+
+
+def make_pdf(lines):
+    """Builds a minimal single-page PDF whose text PyPDF2 can extract."""
+    text_ops = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+    for line in lines:
+        escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        text_ops.append(f"({escaped}) Tj T*")
+    text_ops.append("ET")
+    stream = "\n".join(text_ops).encode("latin-1", "replace")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def sample_resume_lines(candidate):
+    return [
+        f"Candidate {candidate}",
+        f"candidate{candidate}@example.com | +1 555 010 {candidate:04d}",
+        "",
+        "Experience",
+        "- Built a Flask API serving 2M requests per day",
+        "- Reduced p95 latency by 40% with Redis caching",
+        "- Led a team of 4 engineers",
+        "",
+        "Projects",
+        "- Realtime chat with websockets and a queue",
+        "- Resume parser using sentence embeddings",
+        "",
+        "Skills",
+        "- Python, Flask, Redis, PostgreSQL, Docker",
+        "",
+        "Education",
+        "- B.Tech in Computer Science",
+    ]
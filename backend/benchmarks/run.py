@@ -0,0 +1,318 @@
+"""Offline load test for the API.
+
+Every external dependency is replaced by an in-process fake (fakeredis, an
+in-memory Supabase, a deterministic LLM backend with configurable latency,
+a LeetCode responder and hash-based embeddings), so the numbers only move
+when our own code does. Run from the backend directory:
+
+    python -m benchmarks.run --users 8 --concurrency 4
+    python -m benchmarks.run --update-baseline
+
+The run exits with status 1 if any endpoint regressed against
+benchmarks/baseline.json by more than --tolerance, or if any request failed.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from .fakes import (FakeEmbeddings, FakeLeetCode, FakeSentenceModel, FakeSupabase, default_buckets, default_tables,
+                    fake_llm_responder, make_pdf, sample_resume_lines)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SCENARIOS = ("interview", "resume", "batch", "jobs")
+JOB_DESCRIPTION = ("Backend engineer with Python and Flask experience. Must know Redis, PostgreSQL and Docker, "
+                   "design low latency APIs and mentor junior engineers.")
+INTERVIEW_ROUNDS = (("SDE", "HR"), ("SDE", "TECHNICAL_1"), ("DS", "TECHNICAL"))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for the PREP2PRO API.")
+    parser.add_argument("--users", type=int, default=8, help="Virtual users per scenario.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Virtual users running at the same time.")
+    parser.add_argument("--turns", type=int, default=6, help="next_question calls per interview.")
+    parser.add_argument("--batch-size", type=int, default=5, help="Resumes per evaluate_batch request.")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--resume-mode", default="structured", help="Evaluation mode for resume and job requests.")
+    parser.add_argument("--stream", action="store_true", help="Request SSE streams from the interview endpoints.")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Seconds per fake LLM call.")
+    parser.add_argument("--supabase-latency", type=float, default=0.005, help="Seconds per fake Supabase call.")
+    parser.add_argument("--embedding-latency", type=float, default=0.03,
+                        help="Seconds per fake remote embedding call (only with RAG_EMBEDDING_BACKEND=google).")
+    parser.add_argument("--leetcode-latency", type=float, default=0.02, help="Seconds per fake LeetCode call.")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file to compare against.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run's results as the new baseline.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown before failing.")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore p95 regressions smaller than this.")
+    parser.add_argument("--json", dest="json_path", help="Also write the full report to this file.")
+    return parser.parse_args(argv)
+
+
+def install_fakes(args):
+    """Points the app at the fakes. Must run before anything under app/ is imported."""
+    workdir = tempfile.mkdtemp(prefix="prep2pro-bench-")
+    os.environ.update({
+        "REDIS_FAKE": "1",
+        "LLM_BACKEND": "fake",
+        "AUTH_REQUIRED": "false",
+        "RAG_INDEX_DIR": os.path.join(workdir, "rag_index"),
+        "PROBLEM_CATALOG_PATH": os.path.join(workdir, "problem_catalog.json"),
+        "RESUME_INLINE_WORKERS": os.environ.get("RESUME_INLINE_WORKERS", "2"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+
+    supabase_module = types.ModuleType("app.supabase_client")
+    supabase_module.supabase_client = FakeSupabase(default_tables(), default_buckets(), latency=args.supabase_latency)
+    sys.modules["app.supabase_client"] = supabase_module
+
+    from app.embedding_client import embedding_service
+    from app.interview import utils as interview_utils
+    from app.interview.rag_index import best_practices_index
+    from app.llm_gateway import FakeBackend, llm_gateway
+
+    embedding_service._model = FakeSentenceModel()
+    if best_practices_index.backend == "google":
+        best_practices_index._embeddings = FakeEmbeddings(latency=args.embedding_latency)
+    interview_utils.leetcode_session = FakeLeetCode(latency=args.leetcode_latency)
+    llm_gateway.set_backend(FakeBackend(responder=fake_llm_responder, latency=args.llm_latency))
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.errors = {}
+
+    def call(self, name, func):
+        started = time.perf_counter()
+        response = func()
+        if response.is_streamed:
+            # Drain SSE streams so the timing covers the full answer.
+            response.get_data()
+        self.record(name, time.perf_counter() - started, failed=response.status_code >= 400)
+        return response
+
+    def record(self, name, elapsed, failed=False):
+        with self._lock:
+            self.samples.setdefault(name, []).append(elapsed)
+            if failed:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def _pdf(candidate):
+    return make_pdf(sample_resume_lines(candidate))
+
+def interview_scenario(client, recorder, user, args):
+    domain, interview_type = INTERVIEW_ROUNDS[user % len(INTERVIEW_ROUNDS)]
+    response = recorder.call("interview.initialize", lambda: client.post('/interview/initialize', data={
+        "domain": domain,
+        "type": interview_type,
+        "resume": (io.BytesIO(_pdf(user)), f"bench_user_{user}.pdf"),
+    }, content_type="multipart/form-data"))
+    if response.status_code != 200:
+        return
+    session_id = response.get_json()["session_id"]
+    stream = "true" if args.stream else "false"
+
+    for turn in range(args.turns):
+        recorder.call("interview.next_question", lambda: client.post('/interview/next_question', data={
+            "session_id": session_id,
+            "user_answer": f"In turn {turn} I would add a cache in front of the database and shard the queue.",
+            "idempotency_key": f"{user}-{turn}",
+            "stream": stream,
+        }))
+    recorder.call("interview.improvements", lambda: client.post('/interview/improvements', data={
+        "session_id": session_id,
+        "stream": stream,
+    }))
+
+def resume_scenario(client, recorder, user, args):
+    recorder.call("resume.evaluate_resume", lambda: client.post('/resume/evaluate_resume', data={
+        "resume": (io.BytesIO(_pdf(1000 + user)), f"resume_{user}.pdf"),
+        "job_description": JOB_DESCRIPTION,
+        "mode": args.resume_mode,
+        "refresh": "true",
+    }, content_type="multipart/form-data"))
+
+def batch_scenario(client, recorder, user, args):
+    files = [(io.BytesIO(_pdf(2000 + user * args.batch_size + i)), f"batch_{user}_{i}.pdf") for i in range(args.batch_size)]
+    recorder.call("resume.evaluate_batch", lambda: client.post('/resume/evaluate_batch', data={
+        "resumes": files,
+        "job_description": JOB_DESCRIPTION,
+    }, content_type="multipart/form-data"))
+
+def jobs_scenario(client, recorder, user, args):
+    started = time.perf_counter()
+    response = recorder.call("resume.jobs.submit", lambda: client.post('/resume/jobs', data={
+        "resume": (io.BytesIO(_pdf(3000 + user)), f"job_{user}.pdf"),
+        "job_description": JOB_DESCRIPTION,
+        "mode": args.resume_mode,
+        "refresh": "true",
+    }, content_type="multipart/form-data"))
+    if response.status_code != 202:
+        return
+
+    job_id = response.get_json()["job_id"]
+    job = {}
+    deadline = started + 60
+    while time.perf_counter() < deadline:
+        job = client.get(f'/resume/jobs/{job_id}').get_json()
+        if job.get("status") in ("done", "failed"):
+            break
+        time.sleep(0.01)
+
+    # End to end time from submission until a worker finished the job.
+    recorder.record("resume.jobs.end_to_end", time.perf_counter() - started, failed=job.get("status") != "done")
+
+SCENARIO_FUNCS = {
+    "interview": interview_scenario,
+    "resume": resume_scenario,
+    "batch": batch_scenario,
+    "jobs": jobs_scenario,
+}
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+def summarize(recorder, wall_seconds, stages_before, stages_after):
+    endpoints = {}
+    total = 0
+    for name, samples in sorted(recorder.samples.items()):
+        total += len(samples)
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": recorder.errors.get(name, 0),
+            "mean_ms": round(1000 * sum(samples) / len(samples), 2),
+            "p50_ms": round(1000 * percentile(samples, 50), 2),
+            "p95_ms": round(1000 * percentile(samples, 95), 2),
+            "p99_ms": round(1000 * percentile(samples, 99), 2),
+        }
+
+    stages = {}
+    for key, after in stages_after.items():
+        before = stages_before.get(key, {"seconds": 0.0, "count": 0})
+        count = after["count"] - before["count"]
+        if count <= 0:
+            continue
+        seconds = after["seconds"] - before["seconds"]
+        stages[key] = {"count": int(count), "total_s": round(seconds, 3), "mean_ms": round(1000 * seconds / count, 2)}
+
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "requests": total,
+        "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0.0,
+        "endpoints": endpoints,
+        "stages": dict(sorted(stages.items(), key=lambda item: -item[1]["total_s"])),
+    }
+
+def print_report(report):
+    print(f"\n{report['requests']} requests in {report['wall_seconds']}s ({report['throughput_rps']} req/s)\n")
+    print(f"{'endpoint':<28}{'count':>7}{'errors':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:<28}{row['count']:>7}{row['errors']:>8}{row['mean_ms']:>10}{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+    print(f"\n{'stage':<36}{'count':>7}{'total s':>10}{'mean ms':>10}")
+    for name, row in report["stages"].items():
+        print(f"{name:<36}{row['count']:>7}{row['total_s']:>10}{row['mean_ms']:>10}")
+
+def compare(report, baseline, tolerance, min_delta_ms):
+    problems = []
+    for name, row in report["endpoints"].items():
+        if row["errors"]:
+            problems.append(f"{name}: {row['errors']} failed requests")
+        base = baseline.get("endpoints", {}).get(name)
+        if base is None:
+            continue
+        limit = base["p95_ms"] * (1 + tolerance)
+        if row["p95_ms"] > limit and row["p95_ms"] - base["p95_ms"] > min_delta_ms:
+            problems.append(f"{name}: p95 {row['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+
+    base_rps = baseline.get("throughput_rps")
+    if base_rps and report["throughput_rps"] < base_rps * (1 - tolerance):
+        problems.append(f"throughput {report['throughput_rps']} req/s vs baseline {base_rps} req/s")
+    return problems
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenarios: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+
+    install_fakes(args)
+    from app import create_app
+    from app.metrics import stage_summary
+    from app.warmup import warmup
+
+    app = create_app()
+    deadline = time.monotonic() + 60
+    while not warmup.status()["ready"]:
+        if time.monotonic() > deadline:
+            print(f"App did not become ready: {warmup.status()['subsystems']}", file=sys.stderr)
+            return 2
+        time.sleep(0.1)
+
+    # One untimed pass warms caches that a long running server would already have.
+    warmup_recorder = Recorder()
+    for name in scenarios:
+        SCENARIO_FUNCS[name](app.test_client(), warmup_recorder, -1, args)
+
+    recorder = Recorder()
+    stages_before = stage_summary()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [
+            pool.submit(SCENARIO_FUNCS[name], app.test_client(), recorder, user, args)
+            for user in range(args.users) for name in scenarios
+        ]
+        for future in futures:
+            future.result()
+    report = summarize(recorder, time.perf_counter() - started, stages_before, stage_summary())
+    report["settings"] = {
+        key: getattr(args, key)
+        for key in ("users", "concurrency", "turns", "batch_size", "resume_mode", "stream", "llm_latency",
+                    "supabase_latency", "embedding_latency", "leetcode_latency")
+    }
+    report["settings"]["scenarios"] = scenarios
+
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != report["settings"]:
+        print("\nWarning: baseline was recorded with different settings, comparison may be meaningless.")
+
+    problems = compare(report, baseline, args.tolerance, args.min_delta_ms)
+    if problems:
+        print("\nRegressions:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
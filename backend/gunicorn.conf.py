@@ -0,0 +1,67 @@
+# Production server: gunicorn -c gunicorn.conf.py wsgi:app
+#
+# With preload_app the master imports the app and loads the read-only assets
+# (embedding model weights, FAISS index, reference data) once before forking,
+# so every worker shares those pages copy-on-write instead of holding its own
+# copy. Workers are recycled after max_requests (with jitter so they do not
+# all restart at once) to cap memory growth.
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")  # gthread or gevent
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))  # gevent only
+# Preloading before gevent's monkey-patching runs in the worker leaves modules unpatched.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "false" if worker_class == "gevent" else "true").lower() in ("1", "true", "yes")
+
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 100))
+# LLM calls can legitimately take a while; streamed answers keep the worker busy until done.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+accesslog = "-"
+
+# Each worker has its own metric values; the multiprocess directory lets
+# /metrics aggregate them. This file is read before the app (and so
+# prometheus_client) is imported, which is when it has to be set.
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    # Files left by a previous run would be counted again.
+    shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+elif workers > 1:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prep2pro-metrics-")
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from app.warmup import warmup
+
+    warmup.preload()
+    server.log.info(f"Preloaded before fork: {warmup.status()['subsystems']}")
+    # Moves everything loaded so far out of the collector's view, so GC passes
+    # in the workers do not write to (and un-share) those pages.
+    gc.collect()
+    gc.freeze()
+
+def post_worker_init(worker):
+    if worker_class == "gevent":
+        import grpc.experimental.gevent as grpc_gevent # type: ignore
+        grpc_gevent.init_gevent()
+
+    from app import start_background_tasks
+    from app.supabase_client import supabase_client
+
+    supabase_client.reset()
+    start_background_tasks()
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess # type: ignore
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,36 @@
+import argparse
+import multiprocessing
+import time
+from app.config import Config
+from app.resume.jobs import run_worker, requeue_stale_jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume resume evaluation jobs from the Redis queue")
+    parser.add_argument("--processes", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+
+    workers = []
+    for _ in range(args.processes):
+        worker = multiprocessing.Process(target=run_worker, daemon=True)
+        worker.start()
+        workers.append(worker)
+    print(f"Started {len(workers)} resume workers")
+
+    last_requeue = time.monotonic()
+    while True:
+        time.sleep(5)
+        if time.monotonic() - last_requeue >= Config.RESUME_JOB_VISIBILITY_SECONDS / 2:
+            last_requeue = time.monotonic()
+            requeued = requeue_stale_jobs()
+            if requeued:
+                print(f"Requeued {requeued} stale resume jobs")
+        for i, worker in enumerate(workers):
+            if not worker.is_alive():
+                print(f"Resume worker {worker.pid} exited, restarting")
+                workers[i] = multiprocessing.Process(target=run_worker, daemon=True)
+                workers[i].start()
+
+
+if __name__ == '__main__':
+    main()
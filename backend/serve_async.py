@@ -0,0 +1,19 @@
+# Async serving mode: every request runs in a greenlet, so a turn waiting on
+# Gemini, Supabase, LeetCode or Redis no longer pins an OS thread.
+from gevent import monkey # type: ignore
+monkey.patch_all()
+
+import grpc.experimental.gevent as grpc_gevent # type: ignore
+grpc_gevent.init_gevent()
+
+import os
+from gevent.pool import Pool # type: ignore
+from gevent.pywsgi import WSGIServer # type: ignore
+from app.config import Config
+from main import app
+
+if __name__ == '__main__':
+    port = int(os.environ.get("PORT", 5000))
+    server = WSGIServer(("0.0.0.0", port), app, spawn=Pool(Config.ASYNC_MAX_CONNECTIONS))
+    print(f"Serving on port {port} with up to {Config.ASYNC_MAX_CONNECTIONS} concurrent connections")
+    server.serve_forever()
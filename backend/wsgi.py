@@ -0,0 +1,8 @@
+# WSGI entry point for gunicorn (see gunicorn.conf.py). Background threads do
+# not survive fork, so they are started per worker in the post_worker_init hook
+# rather than here.
+from app import create_app
+from flask_cors import CORS # type: ignore
+
+app = create_app(start_background=False)
+CORS(app)
@@ -12,6 +12,7 @@ interface Message {
   role: 'system' | 'user' | 'interviewer';
   content: string;
   timestamp: Date;
+  idempotencyKey?: string;
 }
 
 interface InterviewSession {
@@ -20,6 +21,12 @@ interface InterviewSession {
   error?: string;
 }
 
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost).
+const newIdempotencyKey = () =>
+  typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function'
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
 export function ChatInterface() {
   const [messages, setMessages] = useState<Message[]>([]);
   const [inputMessage, setInputMessage] = useState('');
@@ -30,6 +37,8 @@ export function ChatInterface() {
   const [interviewType, setInterviewType] = useState('TECHNICAL_1');
   const [error, setError] = useState<string | null>(null);
   const messagesEndRef = useRef<HTMLDivElement>(null);
+  // The last answer that did not get a question back; resubmitting it reuses its key.
+  const unansweredRef = useRef<Message | null>(null);
 
   const onDrop = (acceptedFiles: File[]) => {
     setFile(acceptedFiles[0]);
@@ -135,11 +144,16 @@ export function ChatInterface() {
     e.preventDefault();
     if (!inputMessage.trim() || isLoading || !sessionId) return;
 
+    const content = inputMessage.trim();
+    const unanswered = unansweredRef.current;
     const userMessage: Message = {
       role: 'user',
-      content: inputMessage.trim(),
-      timestamp: new Date()
+      content,
+      timestamp: new Date(),
+      // Lets the backend replay the first result if this answer is submitted again.
+      idempotencyKey: unanswered?.content === content ? unanswered.idempotencyKey : newIdempotencyKey()
     };
+    unansweredRef.current = userMessage;
 
     setMessages(prev => [...prev, userMessage]);
     setInputMessage('');
@@ -148,6 +162,7 @@ export function ChatInterface() {
     const formData = new FormData();
     formData.append('session_id', sessionId);
     formData.append('user_answer', userMessage.content);
+    formData.append('idempotency_key', userMessage.idempotencyKey!);
 
     try {
       const response = await fetch('http://localhost:5000/interview/next_question', {
@@ -158,6 +173,7 @@ export function ChatInterface() {
       if (!response.ok) {
         if (response.status === 408) {
           // Interview concluded
+          unansweredRef.current = null;
           const data = await response.json();
           const conclusionMessage: Message = {
             role: 'interviewer',
@@ -220,6 +236,7 @@ export function ChatInterface() {
         timestamp: new Date()
       };
 
+      unansweredRef.current = null;
       setMessages(prev => [...prev, botMessage]);
     } catch (error) {
       console.error('Interview error:', error);